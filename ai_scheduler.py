@@ -0,0 +1,52 @@
+from game_logic import move_enemy_toward_player
+
+# (max distance from the player, ticks between updates); None means any distance
+AI_LOD_BANDS = ((400, 1), (800, 2), (None, 4))
+AI_UPDATE_BUDGET = 24  # Reduced-rate enemy updates allowed per tick
+MAX_CATCH_UP_TICKS = 8  # Longest stretch of movement applied in one update
+
+
+def update_interval(distance):
+    """Ticks between AI updates for an enemy this far (Manhattan) from the player."""
+    for max_distance, interval in AI_LOD_BANDS:
+        if max_distance is None or distance <= max_distance:
+            return interval
+    return AI_LOD_BANDS[-1][1]
+
+
+def update_enemies(enemies, player_pos, obstacles, tick, enemy_size, budget=AI_UPDATE_BUDGET):
+    """
+    Move enemies toward the player at a rate that depends on their distance.
+
+    Enemies in the nearest band update every tick. Farther ones update every
+    few ticks and move by the ticks elapsed since their last update, so their
+    speed is unchanged. At most budget of those reduced-rate updates run per
+    tick, longest-waiting first; the rest wait for a later tick, which keeps
+    AI cost bounded as rooms fill with enemies.
+
+    The budget counts updates rather than milliseconds so the simulation stays
+    deterministic for replays and the balance sweep. Returns the number of
+    enemies updated.
+    """
+    player_x, player_y = player_pos
+    due = []
+    updated = 0
+    for enemy in enemies:
+        if enemy["ai_tick"] is None:
+            enemy["ai_tick"] = tick - 1  # New this room
+        elapsed = tick - enemy["ai_tick"]
+        enemy_x, enemy_y = enemy["pos"]
+        interval = update_interval(abs(enemy_x - player_x) + abs(enemy_y - player_y))
+        if interval == 1:
+            move_enemy_toward_player(enemy, player_pos, obstacles, enemy_size, min(elapsed, MAX_CATCH_UP_TICKS))
+            enemy["ai_tick"] = tick
+            updated += 1
+        elif elapsed >= interval:
+            due.append(enemy)
+
+    due.sort(key=lambda enemy: enemy["ai_tick"])  # Stable, so ties keep list order
+    for enemy in due[:budget]:
+        move_enemy_toward_player(enemy, player_pos, obstacles, enemy_size, min(tick - enemy["ai_tick"], MAX_CATCH_UP_TICKS))
+        enemy["ai_tick"] = tick
+        updated += 1
+    return updated
@@ -0,0 +1,53 @@
+import loaders
+
+
+class Animator:
+    """
+    Time-driven sprite animation with every variant built up front.
+
+    frames maps each state (e.g. "idle", "walk") to its list of source images.
+    The constructor scales every frame once and, when mirror is set, builds the
+    flipped copy for the other facing, so drawing is a table lookup: no
+    per-frame scale or flip, and extra frames only cost memory.
+    """
+
+    def __init__(self, frames, size=None, frame_durations=None, default_duration=500,
+                 mirror=True, source_facing="left"):
+        other_facing = "right" if source_facing == "left" else "left"
+        frame_durations = frame_durations or {}
+
+        self.tables = {}
+        self.durations = {}
+        for state, images in frames.items():
+            scaled = tuple(loaders.scale(image, size, speculative=True) if size else image for image in images)
+            self.tables[(state, source_facing)] = scaled
+            if mirror:
+                self.tables[(state, other_facing)] = tuple(loaders.flip(image, speculative=True) for image in scaled)
+            else:
+                self.tables[(state, other_facing)] = scaled
+            self.durations[state] = frame_durations.get(state, default_duration)
+
+        self.state = next(iter(frames))
+        self.facing = source_facing
+        self.state_start = 0
+
+    def update(self, state, facing, now):
+        """Switch state and facing; the frame timer restarts when the state changes."""
+        if state != self.state:
+            self.state = state
+            self.state_start = now
+        self.facing = facing
+
+    def image(self, now):
+        """The frame to draw at time now (milliseconds)."""
+        table = self.tables[(self.state, self.facing)]
+        if len(table) == 1:
+            image = table[0]
+        else:
+            image = table[int((now - self.state_start) // self.durations[self.state]) % len(table)]
+        loaders.mark_used(image)
+        return image
+
+    def all_frames(self):
+        """Every prebuilt surface, e.g. to warm caches of derived effects."""
+        return [image for table in self.tables.values() for image in table]
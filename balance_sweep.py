@@ -0,0 +1,133 @@
+import argparse
+import csv
+import itertools
+import os
+import statistics
+import time
+from multiprocessing import Pool
+
+import simulation
+from bot import Bot
+from simulation import FPS
+
+MAX_MINUTES = 10  # Simulated minutes before a run that hasn't died is stopped
+SUMMARY_FIELDS = ("level_step", "count_step", "amount", "runs", "died_pct", "rooms_mean", "rooms_median", "rooms_max",
+                  "death_seconds", "room_tick_ms", "room_tick_ms_max")
+
+
+def run_one(job):
+    """Run one seeded headless game with the scripted bot. Returns a result dict."""
+    seed, enemy_level_step, enemy_count_step, amount, max_ticks = job
+    state = simulation.new_game(seed, amount, enemy_level_step=enemy_level_step, enemy_count_step=enemy_count_step)
+    bot = Bot(seed)
+    room_tick_ms = []
+    room_cost = 0.0
+    room_ticks = 0
+    room = 0
+
+    while state["tick"] < max_ticks and not state["dead"]:
+        inputs = bot.inputs(state)
+        start = time.perf_counter()
+        simulation.step(state, inputs)
+        room_cost += time.perf_counter() - start
+        room_ticks += 1
+        if state["room_count"] != room:
+            room_tick_ms.append(room_cost * 1000 / room_ticks)
+            room_cost = 0.0
+            room_ticks = 0
+            room = state["room_count"]
+    if room_ticks:
+        room_tick_ms.append(room_cost * 1000 / room_ticks)
+
+    return {
+        "params": (enemy_level_step, enemy_count_step, amount),
+        "seed": seed,
+        "rooms": state["room_count"],
+        "died": state["dead"],
+        "seconds": state["time"] / 1000,
+        "room_tick_ms": room_tick_ms,
+    }
+
+
+def summarize(results):
+    """Group results by parameter set into summary rows."""
+    groups = {}
+    for result in results:
+        groups.setdefault(result["params"], []).append(result)
+
+    rows = []
+    for (enemy_level_step, enemy_count_step, amount), runs in sorted(groups.items()):
+        rooms = [run["rooms"] for run in runs]
+        deaths = [run["seconds"] for run in runs if run["died"]]
+        room_costs = [cost for run in runs for cost in run["room_tick_ms"]]
+        rows.append({
+            "level_step": enemy_level_step,
+            "count_step": enemy_count_step,
+            "amount": amount,
+            "runs": len(runs),
+            "died_pct": 100 * len(deaths) / len(runs),
+            "rooms_mean": statistics.mean(rooms),
+            "rooms_median": statistics.median(rooms),
+            "rooms_max": max(rooms),
+            "death_seconds": statistics.mean(deaths) if deaths else float("nan"),
+            "room_tick_ms": statistics.mean(room_costs) if room_costs else 0.0,
+            "room_tick_ms_max": max(room_costs) if room_costs else 0.0,
+        })
+    return rows
+
+
+def print_table(rows):
+    """Print summary rows as an aligned table."""
+    print(f"{'lvl step':>8} {'cnt step':>8} {'amount':>6} {'runs':>6} {'died%':>6} {'rooms':>6} "
+          f"{'median':>6} {'max':>4} {'death s':>8} {'tick ms':>8} {'worst':>7}")
+    for row in rows:
+        print(f"{row['level_step']:>8.2f} {row['count_step']:>8} {row['amount']:>6} {row['runs']:>6} "
+              f"{row['died_pct']:>6.1f} {row['rooms_mean']:>6.2f} {row['rooms_median']:>6.1f} {row['rooms_max']:>4} "
+              f"{row['death_seconds']:>8.1f} {row['room_tick_ms']:>8.3f} {row['room_tick_ms_max']:>7.3f}")
+
+
+def parse_list(text, convert):
+    return [convert(value) for value in text.split(",") if value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded headless games across all cores to tune difficulty.")
+    parser.add_argument("--runs", type=int, default=100, help="runs per parameter combination")
+    parser.add_argument("--level-steps", default=str(simulation.ENEMY_LEVEL_STEP),
+                        help="comma separated enemy level multiplier increases per room")
+    parser.add_argument("--count-steps", default=str(simulation.ENEMY_COUNT_STEP),
+                        help="comma separated room counts per extra enemy")
+    parser.add_argument("--amounts", default="0,1,3,5", help="comma separated player Amount answers")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; runs use consecutive seeds")
+    parser.add_argument("--max-minutes", type=float, default=MAX_MINUTES, help="simulated minutes before a run is stopped")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--csv", metavar="PATH", help="also write the summary table as CSV")
+    args = parser.parse_args()
+
+    max_ticks = int(args.max_minutes * 60 * FPS)
+    jobs = [
+        (args.seed + run, enemy_level_step, enemy_count_step, amount, max_ticks)
+        for enemy_level_step, enemy_count_step, amount in itertools.product(
+            parse_list(args.level_steps, float), parse_list(args.count_steps, int), parse_list(args.amounts, int))
+        for run in range(args.runs)
+    ]
+    if not jobs:
+        parser.error("nothing to run: --runs and every parameter list must be non-empty")
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = list(pool.imap_unordered(run_one, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)} runs on {args.workers} workers in {elapsed:.1f}s")
+
+    rows = summarize(results)
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
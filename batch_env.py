@@ -0,0 +1,288 @@
+import argparse
+import time
+
+import numpy as np
+
+import simulation
+from simulation import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, ENEMY_SIZE, DOOR_SIZE, DAMAGE_COOLDOWN, HIT_ANIMATION_DURATION, FRAME_MS,
+    ATTACK_REACH, INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_ATTACK,
+)
+
+MAX_ENEMIES = 32  # Enemy slots per room; later rooms that would spawn more are capped
+OFF_WORLD = -1e9  # Position of padding obstacles, so they never collide
+
+
+def sweep_move(x, y, size, dx, dy, boxes, max_slides=2):
+    """
+    Vectorized geometry.sweep_move for M size x size movers: each moves from
+    (x[i], y[i]) by (dx[i], dy[i]) against its own boxes[i], an (obstacles, 4)
+    array, stopping flush at the first face hit and sliding along it.
+    Returns the new (x, y) arrays.
+    """
+    x, y, dx, dy = (np.array(value, dtype=np.float64) for value in (x, y, dx, dy))
+    active = np.flatnonzero((dx != 0) | (dy != 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_slides + 1):
+            # Boxes outside the bounds of the whole move, or overlapped at the start, can't be hit
+            px, py = x[active, None], y[active, None]
+            pdx, pdy = dx[active, None], dy[active, None]
+            box = boxes[active]
+            box_x, box_y = box[..., 0], box[..., 1]
+            box_right, box_bottom = box_x + box[..., 2], box_y + box[..., 3]
+            overlap_x = (px < box_right) & (box_x < px + size)
+            overlap_y = (py < box_bottom) & (box_y < py + size)
+            candidates = ((box_x < px + size + np.maximum(pdx, 0)) & (box_right > px + np.minimum(pdx, 0))
+                          & (box_y < py + size + np.maximum(pdy, 0)) & (box_bottom > py + np.minimum(pdy, 0))
+                          & ~(overlap_x & overlap_y))
+            blocked = candidates.any(axis=1)
+            free = active[~blocked]
+            x[free] += dx[free]
+            y[free] += dy[free]
+            active = active[blocked]
+            if not len(active):
+                break
+
+            # Entry and exit times along each axis, as fractions of the move, for movers that may hit
+            px, py, pdx, pdy = px[blocked], py[blocked], pdx[blocked], pdy[blocked]
+            box, candidates = box[blocked], candidates[blocked]
+            box_x, box_y, box_right, box_bottom = box_x[blocked], box_y[blocked], box_right[blocked], box_bottom[blocked]
+            overlap_x, overlap_y = overlap_x[blocked], overlap_y[blocked]
+            near_x = np.where(pdx > 0, box_x - px - size, box_right - px) / pdx
+            far_x = np.where(pdx > 0, box_right - px, box_x - px - size) / pdx
+            entry_x = np.where(pdx != 0, near_x, np.where(overlap_x, -np.inf, np.inf))
+            exit_x = np.where(pdx != 0, far_x, np.where(overlap_x, np.inf, -np.inf))
+            near_y = np.where(pdy > 0, box_y - py - size, box_bottom - py) / pdy
+            far_y = np.where(pdy > 0, box_bottom - py, box_y - py - size) / pdy
+            entry_y = np.where(pdy != 0, near_y, np.where(overlap_y, -np.inf, np.inf))
+            exit_y = np.where(pdy != 0, far_y, np.where(overlap_y, np.inf, -np.inf))
+            entry = np.maximum(entry_x, entry_y)
+            hits = candidates & (entry < np.minimum(exit_x, exit_y)) & (entry >= 0)
+
+            # First box hit by each mover
+            entry = np.where(hits, entry, np.inf)
+            first = np.argmin(entry, axis=1)
+            rows = np.arange(len(active))
+            hit_time = entry[rows, first]
+            hit = hit_time < 1
+            missed = active[~hit]
+            x[missed] += dx[missed]
+            y[missed] += dy[missed]
+
+            active, rows, first, hit_time = active[hit], rows[hit], first[hit], hit_time[hit]
+            on_x = entry_x[rows, first] >= entry_y[rows, first]
+            hit_box = box[rows, first]
+            # Flush against the face hit, nudged down so rounding can't leave an overlap
+            near_edge = np.where(on_x, hit_box[:, 0], hit_box[:, 1])
+            flush = near_edge - size
+            while (flush + size > near_edge).any():
+                flush = np.where(flush + size > near_edge, np.nextafter(flush, -np.inf), flush)
+            far_edge = np.where(on_x, hit_box[:, 0] + hit_box[:, 2], hit_box[:, 1] + hit_box[:, 3])
+            contact = np.where(np.where(on_x, dx[active], dy[active]) > 0, flush, far_edge)
+
+            # Stop on the face and keep the rest of the motion along it
+            x[active] = np.where(on_x, contact, x[active] + dx[active] * hit_time)
+            y[active] = np.where(on_x, y[active] + dy[active] * hit_time, contact)
+            dx[active] = np.where(on_x, 0, dx[active] * (1 - hit_time))
+            dy[active] = np.where(on_x, dy[active] * (1 - hit_time), 0)
+            active = active[(dx[active] != 0) | (dy[active] != 0)]
+    return x, y
+
+
+def _overlaps(x, y, width, height, other_x, other_y, other_width, other_height):
+    """Elementwise rectangle overlap (touching edges do not count)."""
+    return (x < other_x + other_width) & (other_x < x + width) & (y < other_y + other_height) & (other_y < y + height)
+
+
+class BatchEnv:
+    """
+    Many independent runs stepped together, with their state in stacked arrays.
+
+    Slot i plays simulation.new_game(seed + i): rooms are generated by the
+    same code (and room library) as the game, and each slot moves to its next
+    room the way enter_next_room does. Everything that changes per tick lives
+    in arrays with the slots along the first axis, and step() advances all
+    slots with array operations, following simulation.step's rules for
+    movement, collision, attacks, damage and doors. Two simplifications:
+    every enemy moves every tick (no AI level of detail) and enemies are not
+    pushed apart from each other.
+
+    The arrays are allocated once and updated in place, so the observation
+    dict holds the live arrays themselves: read it, don't keep it across
+    steps expecting old values. Slots that die stay frozen until reset().
+    """
+
+    def __init__(self, num_rooms, world_size=(WINDOW_WIDTH, WINDOW_HEIGHT), obstacle_density=1.0,
+                 enemy_density=1.0, max_enemies=MAX_ENEMIES, room_library=None):
+        self.num_rooms = num_rooms
+        self.world_size = world_size
+        self.obstacle_density = obstacle_density
+        self.enemy_density = enemy_density
+        self.max_enemies = max_enemies
+        self.room_library = room_library
+        self.states = []  # Per-slot simulation state, used only to generate rooms
+
+        n = num_rooms
+        obstacle_count = simulation.scaled_count(simulation.OBSTACLE_COUNT, obstacle_density, *world_size)
+        self.time = np.zeros(n)
+        self.room_count = np.zeros(n, dtype=np.int64)
+        self.player_pos = np.zeros((n, 2))
+        self.player_health = np.zeros(n)
+        self.move_speed = np.zeros(n)
+        self.player_damage = np.zeros(n)
+        self.enemy_level = np.zeros(n)
+        self.last_damage_time = np.zeros(n)
+        self.last_attack_time = np.zeros(n)
+        self.door_pos = np.zeros((n, 2))
+        self.obstacles = np.zeros((n, obstacle_count, 4))
+        self.enemy_pos = np.zeros((n, max_enemies, 2))
+        self.enemy_health = np.zeros((n, max_enemies))
+        self.enemy_speed = np.zeros((n, max_enemies))
+        self.enemy_alive = np.zeros((n, max_enemies), dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+        self.observation = {
+            "player_pos": self.player_pos,
+            "player_health": self.player_health,
+            "room_count": self.room_count,
+            "door_pos": self.door_pos,
+            "obstacles": self.obstacles,
+            "enemy_pos": self.enemy_pos,
+            "enemy_health": self.enemy_health,
+            "enemy_alive": self.enemy_alive,
+            "done": self.done,
+        }
+
+    def _load_room(self, slot):
+        """Copy the slot's freshly generated room from its simulation state into the arrays."""
+        state = self.states[slot]
+        self.room_count[slot] = state["room_count"]
+        self.enemy_level[slot] = state["enemy_level_multiplier"]
+        self.player_pos[slot] = state["player_pos"]
+        self.door_pos[slot] = state["door_pos"]
+
+        obstacles = self.obstacles[slot]
+        obstacles[:] = (OFF_WORLD, OFF_WORLD, 0, 0)
+        for index, (x, y, width, height, _) in enumerate(state["obstacles"][:len(obstacles)]):
+            obstacles[index] = (x, y, width, height)
+
+        enemies = state["enemies"][:self.max_enemies]
+        count = len(enemies)
+        self.enemy_alive[slot] = False
+        self.enemy_alive[slot, :count] = True
+        self.enemy_health[slot] = 0
+        for index, enemy in enumerate(enemies):
+            self.enemy_pos[slot, index] = enemy["pos"]
+            self.enemy_health[slot, index] = enemy["health"]
+            self.enemy_speed[slot, index] = enemy["speed"]
+
+    def reset(self, seed=0, amount=0):
+        """Start a new run in every slot (slot i uses seed + i). Returns the observation dict."""
+        self.states = [
+            simulation.new_game(seed + slot, amount, self.world_size, self.obstacle_density, self.enemy_density,
+                                room_library=self.room_library)
+            for slot in range(self.num_rooms)
+        ]
+        self.time[:] = 0
+        self.last_damage_time[:] = 0
+        self.last_attack_time[:] = 0
+        self.done[:] = False
+        for slot, state in enumerate(self.states):
+            self.player_health[slot] = state["player_health"]
+            self.move_speed[slot] = state["move_speed"]
+            self.player_damage[slot] = state["player_damage"]
+            self._load_room(slot)
+        return self.observation
+
+    def step(self, actions):
+        """
+        Advance every live slot by one tick.
+
+        actions holds one simulation INPUT_* bitmask per slot. Returns
+        (observation, rewards, dones, info): the reward is 1 for a slot that
+        went through the door this tick, dones marks slots whose player died.
+        """
+        actions = np.asarray(actions)
+        live = ~self.done
+        self.time[live] += FRAME_MS
+        now = self.time
+
+        # Player movement, swept against the buildings like simulation.step
+        dx = (((actions & INPUT_RIGHT) != 0).astype(float) - ((actions & INPUT_LEFT) != 0)) * self.move_speed * live
+        dy = (((actions & INPUT_DOWN) != 0).astype(float) - ((actions & INPUT_UP) != 0)) * self.move_speed * live
+        new_x, new_y = sweep_move(self.player_pos[:, 0], self.player_pos[:, 1], PLAYER_SIZE, dx, dy, self.obstacles)
+        self.player_pos[:, 0] = new_x
+        self.player_pos[:, 1] = new_y
+        player_x = self.player_pos[:, 0:1]
+        player_y = self.player_pos[:, 1:2]
+
+        # Enemies walk straight toward the player at their speed; only live ones are swept
+        slots, indices = np.nonzero(self.enemy_alive & live[:, None])
+        enemy_x = self.enemy_pos[slots, indices, 0]
+        enemy_y = self.enemy_pos[slots, indices, 1]
+        to_x = self.player_pos[slots, 0] - enemy_x
+        to_y = self.player_pos[slots, 1] - enemy_y
+        distance = np.hypot(to_x, to_y)
+        scale = self.enemy_speed[slots, indices] / np.where(distance > 0, distance, np.inf)
+        moved_x, moved_y = sweep_move(enemy_x, enemy_y, ENEMY_SIZE, to_x * scale, to_y * scale, self.obstacles[slots])
+        self.enemy_pos[slots, indices, 0] = moved_x
+        self.enemy_pos[slots, indices, 1] = moved_y
+        new_x = self.enemy_pos[..., 0]
+        new_y = self.enemy_pos[..., 1]
+
+        # Attacks hit every enemy in the attack range
+        attacking = live & ((actions & INPUT_ATTACK) != 0) & (now - self.last_attack_time > HIT_ANIMATION_DURATION)
+        self.last_attack_time[attacking] = now[attacking]
+        in_range = _overlaps(player_x - ATTACK_REACH, player_y - ATTACK_REACH, PLAYER_SIZE + 2 * ATTACK_REACH,
+                             PLAYER_SIZE + 2 * ATTACK_REACH, new_x, new_y, ENEMY_SIZE, ENEMY_SIZE)
+        self.enemy_health -= np.where(self.enemy_alive & in_range & attacking[:, None], self.player_damage[:, None], 0)
+
+        # One enemy touching the player deals damage per cooldown
+        touching = (self.enemy_alive & (self.enemy_health > 0)
+                    & _overlaps(player_x, player_y, PLAYER_SIZE, PLAYER_SIZE, new_x, new_y, ENEMY_SIZE, ENEMY_SIZE))
+        hit = live & touching.any(axis=1) & (now - self.last_damage_time > DAMAGE_COOLDOWN)
+        self.player_health[hit] -= 10 * self.enemy_level[hit]
+        self.last_damage_time[hit] = now[hit]
+        self.enemy_alive &= self.enemy_health > 0
+
+        died = live & (self.player_health <= 0)
+        self.done |= died
+
+        # Cleared rooms with the player in the door move on; generation runs per slot, only for those
+        cleared = live & ~died & ~self.enemy_alive.any(axis=1) & _overlaps(
+            self.player_pos[:, 0], self.player_pos[:, 1], PLAYER_SIZE, PLAYER_SIZE,
+            self.door_pos[:, 0], self.door_pos[:, 1], DOOR_SIZE, DOOR_SIZE)
+        for slot in np.flatnonzero(cleared):
+            simulation.enter_next_room(self.states[slot])
+            self._load_room(slot)
+
+        rewards = cleared.astype(np.float64)
+        return self.observation, rewards, self.done, {"died": died}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step many rooms at once with random input and report throughput.")
+    parser.add_argument("--rooms", type=int, default=1000, help="rooms stepped together")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks to step")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; slot i uses seed + i")
+    args = parser.parse_args()
+
+    env = BatchEnv(args.rooms)
+    start = time.perf_counter()
+    env.reset(args.seed)
+    reset_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    rooms_cleared = 0
+    for _ in range(args.ticks):
+        _, rewards, _, _ = env.step(rng.integers(0, 32, args.rooms))
+        rooms_cleared += int(rewards.sum())
+    elapsed = time.perf_counter() - start
+    print(f"Reset {args.rooms} rooms in {reset_s:.2f}s")
+    print(f"{args.ticks} ticks x {args.rooms} rooms in {elapsed:.2f}s "
+          f"({args.ticks * args.rooms / elapsed:.0f} room-ticks/s, {elapsed / args.ticks * 1000:.2f}ms per batched step)")
+    print(f"Rooms cleared: {rooms_cleared}  Dead: {int(env.done.sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import random
+import time
+
+import simulation
+from game_logic import walk_path
+from geometry import Rect
+from room_library import ROOM_LIBRARY_FILE, open_library
+from simulation import PLAYER_SIZE, ENEMY_SIZE, DOOR_SIZE, FPS, WINDOW_WIDTH, WINDOW_HEIGHT
+
+PATH_STEP = PLAYER_SIZE // 2  # Spacing of the bot's waypoints, in pixels
+STUCK_DETOUR_TICKS = 20  # Ticks spent side-stepping after bumping into a building
+
+
+class Bot:
+    """
+    Deterministic scripted player producing simulation input bitmasks.
+
+    It picks the nearest enemy and walks to it, holding attack while any
+    enemy is inside the attack range, then walks to the door once the room is
+    clear. Walks follow waypoints from a path search around the buildings,
+    replanned when the chased enemy has moved away from where the path ends
+    and whenever the bot stops making progress, in which case it also
+    side-steps for a while. All of its randomness comes from its own
+    Random(seed), kept apart from the room generator, so a seed gives the
+    same run headless and in the window.
+    """
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.target = None  # Enemy record being chased
+        self.path = None  # Waypoints to the current goal
+        self.planned_at = None  # Where the goal was when the path was planned
+        self.room = None
+        self.detour = 0
+        self.detour_ticks = 0
+        self.last_pos = None
+
+    def inputs(self, state):
+        """Input bitmask for the next tick of state."""
+        player_x, player_y = state["player_pos"]
+        enemies = state["enemies"]
+        inputs = 0
+        if state["room_count"] != self.room:
+            self.room = state["room_count"]
+            self.target = None
+            self.path = None
+
+        if enemies:
+            if not any(enemy is self.target for enemy in enemies):
+                # Records are pooled, so identity only holds while the enemy is alive
+                self.target = min(
+                    enemies,
+                    key=lambda enemy: abs(enemy["pos"][0] - player_x) + abs(enemy["pos"][1] - player_y),
+                )
+                self.path = None
+            target_x, target_y = self.target["pos"]
+            # Anywhere the player touches this rect, the attack range touches the enemy
+            reach = simulation.ATTACK_REACH
+            goal = Rect(target_x - reach, target_y - reach, ENEMY_SIZE + 2 * reach, ENEMY_SIZE + 2 * reach)
+            attack_range = simulation.attack_range(state["player_pos"])
+            if any(attack_range.colliderect(Rect(enemy["pos"][0], enemy["pos"][1], ENEMY_SIZE, ENEMY_SIZE))
+                   for enemy in enemies):
+                inputs |= simulation.INPUT_ATTACK
+        else:
+            if self.target is not None:
+                self.target = None  # Room cleared: head for the door
+                self.path = None
+            door_x, door_y = state["door_pos"]
+            goal = Rect(door_x, door_y, DOOR_SIZE, DOOR_SIZE)
+
+        if self.detour_ticks > 0:
+            self.detour_ticks -= 1
+            inputs |= self.detour
+            self.last_pos = None  # Progress is only judged on steered moves
+        else:
+            target_x, target_y = self._next_waypoint(state, goal)
+            inputs |= self._steer(state, target_x, target_y)
+            self.last_pos = (player_x, player_y)
+        return inputs
+
+    def _next_waypoint(self, state, goal):
+        """Next point on the path to goal, planning a new path if needed."""
+        player_x, player_y = state["player_pos"]
+        if self.path is not None and abs(goal.x - self.planned_at[0]) + abs(goal.y - self.planned_at[1]) > PATH_STEP:
+            self.path = None  # The enemy moved on
+        if self.path is None:
+            self.path = walk_path(
+                state["player_pos"], goal, state["obstacles"], PLAYER_SIZE,
+                state["world_width"], state["world_height"], PATH_STEP,
+            ) or []
+            self.planned_at = (goal.x, goal.y)
+
+        reach = state["move_speed"]
+        while self.path and abs(self.path[0][0] - player_x) <= reach and abs(self.path[0][1] - player_y) <= reach:
+            self.path.pop(0)
+        if self.path:
+            return self.path[0]
+        # Out of waypoints (or no path from here): head straight for the goal's center
+        return goal.x + goal.width // 2 - PLAYER_SIZE // 2, goal.y + goal.height // 2 - PLAYER_SIZE // 2
+
+    def _steer(self, state, target_x, target_y):
+        """Movement bits toward the target, starting a detour if the last move went nowhere."""
+        player_x, player_y = state["player_pos"]
+        deadzone = state["move_speed"]
+        inputs = 0
+        if target_x < player_x - deadzone:
+            inputs |= simulation.INPUT_LEFT
+        elif target_x > player_x + deadzone:
+            inputs |= simulation.INPUT_RIGHT
+        if target_y < player_y - deadzone:
+            inputs |= simulation.INPUT_UP
+        elif target_y > player_y + deadzone:
+            inputs |= simulation.INPUT_DOWN
+
+        # Moving but not getting anywhere: walk around the obstacle for a while, then replan
+        if inputs & simulation.INPUT_MOVE and self.last_pos == (player_x, player_y):
+            self.detour_ticks = STUCK_DETOUR_TICKS
+            if inputs & (simulation.INPUT_LEFT | simulation.INPUT_RIGHT):
+                self.detour = simulation.INPUT_UP if self.rng.random() < 0.5 else simulation.INPUT_DOWN
+            else:
+                self.detour = simulation.INPUT_LEFT if self.rng.random() < 0.5 else simulation.INPUT_RIGHT
+            self.path = None
+        return inputs
+
+
+def play_headless(seed, max_ticks, **game_options):
+    """
+    Run the bot through simulation.step as fast as possible, without a window,
+    until it dies or max_ticks pass. Returns the final state and the wall-clock
+    cost of each tick in milliseconds.
+    """
+    state = simulation.new_game(seed, **game_options)
+    bot = Bot(seed)
+    step_times = []
+    while state["tick"] < max_ticks and not state["dead"]:
+        inputs = bot.inputs(state)
+        start = time.perf_counter()
+        simulation.step(state, inputs)
+        step_times.append((time.perf_counter() - start) * 1000)
+    return state, step_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a seeded bot run headlessly and report per-tick cost.")
+    parser.add_argument("--seed", type=int, default=0, help="seed for room generation and the bot")
+    parser.add_argument("--minutes", type=float, default=5, help="simulated minutes before the run is stopped")
+    # Same room options, and defaults, as main.py, so "main.py --bot" plays the same run
+    parser.add_argument("--world", default=f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}", metavar="WIDTHxHEIGHT",
+                        help="room size in pixels")
+    parser.add_argument("--obstacle-density", type=float, default=1.0, help="obstacles per window-sized area, relative to normal")
+    parser.add_argument("--enemy-density", type=float, default=1.0, help="enemies per window-sized area, relative to normal")
+    parser.add_argument("--room-library", default=ROOM_LIBRARY_FILE, metavar="PATH",
+                        help="pre-generated room layouts to use if the file exists; an empty path generates every room")
+    args = parser.parse_args()
+    try:
+        world_size = simulation.parse_world_size(args.world, args.obstacle_density)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    state, step_times = play_headless(args.seed, int(args.minutes * 60 * FPS), world_size=world_size,
+                                      obstacle_density=args.obstacle_density, enemy_density=args.enemy_density,
+                                      room_library=open_library(args.room_library))
+    elapsed = time.perf_counter() - start
+
+    ticks = len(step_times)
+    ordered = sorted(step_times)
+    print(f"Seed: {args.seed}  Ticks: {ticks} in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"Rooms reached: {state['room_count']}  Died: {state['dead']}")
+    if ticks:
+        print(f"Tick cost ms: mean {sum(step_times) / ticks:.3f}  "
+              f"p95 {ordered[min(ticks - 1, int(ticks * 0.95))]:.3f}  max {ordered[-1]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
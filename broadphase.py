@@ -0,0 +1,96 @@
+import bisect
+import math
+
+
+class SweepIndex:
+    """
+    Sort-and-sweep broadphase over equally sized enemy boxes.
+
+    Enemies are sorted by their left edge once per tick; rect queries then only
+    look at the slice of enemies whose x-interval can overlap the rect, and the
+    enemy-enemy sweep only compares neighbours that overlap along x.
+    """
+
+    def __init__(self, enemies, size):
+        self.enemies = enemies  # The list indexed, so callers can tell whether the index is for the current room
+        self.size = size
+        self.boxes = sorted((enemy["pos"][0], enemy["pos"][1], index) for index, enemy in enumerate(enemies))
+        self.lefts = [box[0] for box in self.boxes]
+
+    def query(self, rect):
+        """Return the indices of enemies overlapping rect, given as (x, y, width, height) or a Rect."""
+        x, y, width, height = rect
+        size = self.size
+        start = bisect.bisect_right(self.lefts, x - size)
+        end = bisect.bisect_left(self.lefts, x + width)
+        return [index for _, enemy_y, index in self.boxes[start:end]
+                if enemy_y < y + height and y < enemy_y + size]
+
+    def overlapping_pairs(self):
+        """Return (index, index) pairs of enemies whose boxes overlap each other."""
+        pairs = []
+        boxes = self.boxes
+        size = self.size
+        count = len(boxes)
+        for i, (left, top, index) in enumerate(boxes):
+            for j in range(i + 1, count):  # Indexing, not a slice: no copy of the rest of the list per enemy
+                other_left, other_top, other_index = boxes[j]
+                if other_left >= left + size:
+                    break  # Sorted by x: nothing further along can overlap
+                if abs(other_top - top) < size:
+                    pairs.append((index, other_index))
+        return pairs
+
+
+def remove_dead(enemies, pool=None):
+    """
+    Drop every defeated enemy in one pass, keeping the list object; their
+    records go back to pool. Returns True if any enemy was removed.
+    """
+    if all(enemy["health"] > 0 for enemy in enemies):
+        return False  # Nothing died this tick, nothing to rebuild
+    if pool:
+        for enemy in enemies:
+            if enemy["health"] <= 0:
+                pool.release(enemy)
+    enemies[:] = [enemy for enemy in enemies if enemy["health"] > 0]
+    return True
+
+
+class SpatialGrid:
+    """
+    Uniform grid over static rects (obstacles) for fast region queries.
+
+    Built once per room; each rect is stored in every cell it touches, so a
+    query only visits the cells covered by the query rect.
+    """
+
+    def __init__(self, items, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        for item in items:
+            x, y, width, height = item[:4]
+            for cell in self._cells_for(x, y, width, height):
+                self.cells.setdefault(cell, []).append(item)
+
+    def _cells_for(self, x, y, width, height):
+        size = self.cell_size
+        first_x, first_y = int(x // size), int(y // size)
+        for cell_x in range(first_x, max(first_x + 1, math.ceil((x + width) / size))):
+            for cell_y in range(first_y, max(first_y + 1, math.ceil((y + height) / size))):
+                yield cell_x, cell_y
+
+    def query(self, rect):
+        """Return the stored items overlapping rect, each once, in insertion order per cell."""
+        x, y, width, height = rect
+        found = []
+        seen = set()
+        for cell in self._cells_for(x, y, width, height):
+            for item in self.cells.get(cell, ()):
+                if id(item) in seen:
+                    continue
+                item_x, item_y, item_width, item_height = item[:4]
+                if item_x < x + width and x < item_x + item_width and item_y < y + height and y < item_y + item_height:
+                    seen.add(id(item))
+                    found.append(item)
+        return found
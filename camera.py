@@ -0,0 +1,29 @@
+class Camera:
+    """
+    Viewport into a world that may be larger than the window.
+
+    follow() centres the view on a target and clamps it to the world edges;
+    world-space positions are converted with to_screen() when drawing.
+    """
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.width = view_width
+        self.height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    def follow(self, target_x, target_y):
+        """Centre the view on the target, staying inside the world."""
+        self.x = int(min(max(target_x - self.width // 2, 0), max(self.world_width - self.width, 0)))
+        self.y = int(min(max(target_y - self.height // 2, 0), max(self.world_height - self.height, 0)))
+
+    @property
+    def viewport(self):
+        """The visible world area as (x, y, width, height)."""
+        return self.x, self.y, self.width, self.height
+
+    def to_screen(self, x, y):
+        """Convert a world position to a screen position."""
+        return x - self.x, y - self.y
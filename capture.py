@@ -0,0 +1,152 @@
+import atexit
+import os
+import queue
+import shlex
+import struct
+import subprocess
+import threading
+import zlib
+
+import numpy as np
+
+CAPTURE_ENV = "HABITS_CAPTURE"  # Where to record frames; same as --capture
+RING_SIZE = 4  # Frame buffers shared with the encoder; frames are dropped when all are in use
+PNG_COMPRESSION = 1  # zlib level: fast enough to keep up, still far smaller than raw
+RAW_EXTENSIONS = (".rgb", ".raw")
+
+
+def write_png(path, rgb):
+    """
+    Write an (height, width, 3) uint8 array as a PNG.
+
+    Encoded here with zlib rather than pygame.image.save, which holds the GIL
+    for the whole encode and would stall the game thread; zlib releases it.
+    """
+    height, width, _ = rgb.shape
+    rows = np.empty((height, 1 + width * 3), dtype=np.uint8)
+    rows[:, 0] = 0  # No filter on any row
+    rows[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(rows, PNG_COMPRESSION)))
+        file.write(chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """
+    Records presented frames from a background encoder thread.
+
+    capture() copies the screen's pixels into one of ring_size preallocated
+    buffers and returns; converting and writing happen on the encoder thread,
+    which hands each buffer back when done. If every buffer is still waiting
+    for the encoder, the frame is dropped instead of waiting. Frames are
+    numbered by presented frame, so drops show up as gaps.
+
+    path is a directory for a PNG sequence (frame_000001.png, ...) or a .rgb
+    or .raw file for one stream of raw RGB24 frames. encoder, if given,
+    replaces the path: a command run with the raw RGB24 frames on its stdin,
+    where {width}, {height} and {fps} are filled in, e.g.
+    "ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {fps} -i - run.mp4".
+    Write errors are printed, never raised into the game. close() also runs at
+    interpreter exit, so frames already captured are written even when a
+    scene ends the game with exit().
+    """
+
+    def __init__(self, surface, path=None, encoder=None, fps=30, ring_size=RING_SIZE):
+        if surface.get_bitsize() != 32:
+            raise ValueError("frame capture needs a 32-bit display surface")
+        self.width, self.height = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.shifts = surface.get_shifts()[:3]
+        self.buffers = [np.empty(self.pitch * self.height, dtype=np.uint8) for _ in range(ring_size)]
+        self.free = queue.Queue()
+        for index in range(ring_size):
+            self.free.put(index)
+        self.pending = queue.Queue()
+        self.frames = 0  # Frames presented while capturing
+        self.dropped = 0
+        self.written = 0
+        self.failed = False
+
+        self.directory = None
+        self.stream = None
+        self.process = None
+        if encoder:
+            command = encoder.format(width=self.width, height=self.height, fps=fps)
+            self.process = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE)
+            self.stream = self.process.stdin
+        elif path.lower().endswith(RAW_EXTENSIONS):
+            self.stream = open(path, "wb")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.directory = path
+        self.thread = threading.Thread(target=self._run, name="frame capture", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def capture(self, surface):
+        """Copy surface's pixels for the encoder; returns False if the frame was dropped."""
+        self.frames += 1
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        pixels = surface.get_buffer()  # Locks the surface until released
+        np.copyto(self.buffers[index], np.frombuffer(pixels, dtype=np.uint8))
+        del pixels
+        self.pending.put((index, self.frames))
+        return True
+
+    def close(self):
+        """Write every frame already captured and stop the encoder. Safe to call more than once."""
+        if not self.thread.is_alive():
+            return
+        self.pending.put(None)
+        self.thread.join()
+        if self.stream:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+        if self.process:
+            self.process.wait()
+
+    def report(self):
+        """One-line summary of the recording."""
+        return f"Frame capture: {self.written} frames written, {self.dropped} of {self.frames} dropped"
+
+    def _rgb(self, index):
+        """The buffer's pixels as an (height, width, 3) RGB array."""
+        pixels = self.buffers[index].view(np.uint32).reshape(self.height, self.pitch // 4)[:, :self.width]
+        rgb = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        for channel, shift in enumerate(self.shifts):
+            rgb[..., channel] = pixels >> shift
+        return rgb
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            index, frame = item
+            try:
+                rgb = self._rgb(index)
+            finally:
+                self.free.put(index)  # The copy is done with; let the game reuse the buffer
+            if self.failed:
+                continue
+            try:
+                if self.directory:
+                    write_png(os.path.join(self.directory, f"frame_{frame:06d}.png"), rgb)
+                else:
+                    self.stream.write(rgb)
+                self.written += 1
+            except OSError as e:
+                print(f"Frame capture stopped: {e}")
+                self.failed = True
@@ -0,0 +1,44 @@
+class RoomCheckpoint:
+    """
+    Compact record of a room as it was when the player entered it.
+
+    Obstacles are shared with the state rather than copied: a room's obstacle
+    list is never modified, only replaced when the next room is generated, so
+    the reference stays valid. Enemies are mutated every tick and are stored as
+    plain (x, y, health, speed) tuples. No Surfaces are kept; the renderer maps
+    building ids to sprites as usual.
+    """
+
+    __slots__ = ("room_count", "player_health", "enemy_level_multiplier", "obstacles", "player_pos", "door_pos",
+                 "enemies", "rng_state")
+
+    def __init__(self, state):
+        self.room_count = state["room_count"]
+        self.player_health = state["player_health"]
+        self.enemy_level_multiplier = state["enemy_level_multiplier"]
+        self.obstacles = state["obstacles"]
+        self.player_pos = tuple(state["player_pos"])
+        self.door_pos = tuple(state["door_pos"])
+        self.enemies = tuple(
+            (enemy["pos"][0], enemy["pos"][1], enemy["health"], enemy["speed"]) for enemy in state["enemies"]
+        )
+        self.rng_state = state["rng"].getstate()  # Rooms after a retry are the same ones as before
+
+    def restore(self, state):
+        """Put the room back into state exactly as it was entered, without regenerating anything."""
+        state["room_count"] = self.room_count
+        state["player_health"] = self.player_health
+        state["enemy_level_multiplier"] = self.enemy_level_multiplier
+        state["obstacles"] = self.obstacles
+        state["player_pos"] = list(self.player_pos)
+        state["door_pos"] = list(self.door_pos)
+        pool = state["enemy_pool"]
+        pool.release_all(state["enemies"])
+        state["enemies"] = [pool.acquire(x, y, health, speed) for x, y, health, speed in self.enemies]
+        state["rng"].setstate(self.rng_state)
+
+        # Timers restart; the simulation clock itself keeps running
+        state["last_damage_time"] = 0
+        state["player_last_hit_time"] = 0
+        state["last_input_time"] = state["time"]
+        state["dead"] = False
@@ -1,14 +1,17 @@
 import pygame
-from game_logic import restart_game
+import loaders
+import postfx
+import tracer
 import os
+from ui import UI, Button, ImagePanel, Label
 
 TEXT_COLOR = (255, 255, 255)
 TEXT_SHADOW_COLOR = (0, 0, 0)
 
 def load_health_bar_assets():
     """Load the health bar background image."""
-    health_bar_base = pygame.image.load("assets/others/health_bar_background.png")
-    scaled_health_bar = pygame.transform.scale(health_bar_base, (280, 80))
+    health_bar_base = loaders.load_image("assets/others/health_bar_background.png")
+    scaled_health_bar = loaders.scale(health_bar_base, (280, 80))
     return scaled_health_bar
 
 def display_health_bar(screen, health, max_health, health_bar_base, position, player_level):
@@ -58,10 +61,30 @@ def load_font():
     """Load the 8-bit font."""
     return pygame.font.Font("assets/others/8bit_font.ttf", 20)  # Adjust font size as needed
 
-def draw_obstacles(screen, obstacles):
-    """Draw obstacles with their assigned dimensions and images."""
-    for x, y, width, height, image in obstacles:
-        screen.blit(pygame.transform.scale(image, (width, height)), (x, y))
+def scaled_sprite(image, scale):
+    """Return image scaled by a factor, cached so each size is only built once."""
+    loaders.mark_used(image)
+    if scale == 1:
+        return image
+    width, height = image.get_size()
+    result = postfx.cached(("scaled", image, scale),
+                           lambda: pygame.transform.scale(image, (max(1, int(width * scale)), max(1, int(height * scale)))))
+    loaders.mark_used(result)
+    return result
+
+def draw_background(screen, background_image, offset=(0, 0)):
+    """Tile the background so it scrolls with the camera offset."""
+    tile_width, tile_height = background_image.get_size()
+    start_x = -(offset[0] % tile_width)
+    start_y = -(offset[1] % tile_height)
+    for x in range(start_x, screen.get_width(), tile_width):
+        for y in range(start_y, screen.get_height(), tile_height):
+            screen.blit(background_image, (x, y))
+
+def draw_obstacles(screen, obstacles, building_images, offset=(0, 0), scale=1):
+    """Draw obstacles using the pre-scaled image for each obstacle's sprite id."""
+    for x, y, width, height, sprite_id in obstacles:
+        screen.blit(building_images[sprite_id], ((x - offset[0]) * scale, (y - offset[1]) * scale))
 
 def draw_enemies(screen, enemies, enemy_size, enemy_image):
     """Draw all enemies using the enemy image."""
@@ -93,22 +116,14 @@ def display_health(screen, health, font):
     """Display the player health with a shadow."""
     render_text_with_shadow(screen, f"Health: {health}", font, TEXT_COLOR, TEXT_SHADOW_COLOR, (10, 50))
 
-def blur_surface(surface, amount):
-    """Applies a blur effect to the given surface."""
-    scale = max(1, int(amount))
-    small_surface = pygame.transform.scale(surface,
-                   (surface.get_width() // scale, surface.get_height() // scale))
-    return pygame.transform.scale(small_surface, surface.get_size())
-
-
-
-def show_death_screen(screen, font, sign_image, window_width, window_height, PLAYER_HEALTH, DOOR_SIZE, PLAYER_SIZE,
-                      OBSTACLE_COUNT, TILE_SIZE, SPACING, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, building_images,
-                      ENEMY_COUNT, ENEMY_SIZE):
+def show_death_screen(screen, font, sign_image, window_width, window_height):
     """
-    Displays the death screen and handles restart logic.
+    Displays the death screen until the player picks an option.
+
+    Returns "restart" (back to the first room) or "retry" (the room the player
+    died in); the caller restores the matching room checkpoint. Home leaves
+    the game.
     """
-    running = True
     clock = pygame.time.Clock()
 
     # Center the sign
@@ -118,49 +133,27 @@ def show_death_screen(screen, font, sign_image, window_width, window_height, PLA
     button_width = 150
     button_height = 50
     button_spacing = 20  # Space between buttons
-
-    button1_rect = pygame.Rect(
-        sign_rect.centerx - button_width // 2,
-        sign_rect.bottom - button_height * 2 - 100,  # Positioned above the bottom edge
-        button_width,
-        button_height,
+    top_row = sign_rect.bottom - button_height * 2 - 100  # Positioned above the bottom edge
+
+    # Blurred and dimmed game frame behind the sign, composed once
+    backdrop = postfx.backdrop(screen.copy(), blur_radius=10, dim=0.35, vignette=0.5)
+
+    # Restart and Retry room side by side, Home below them
+    ui = UI(
+        ImagePanel(sign_image, sign_rect.topleft),
+        Label("GAME OVER", font, (0, 0, 0), (sign_rect.centerx, sign_rect.top + 30)),
+        Button((sign_rect.centerx - button_width - button_spacing // 2, top_row, button_width, button_height),
+               "Restart", font, (255, 0, 0), "restart"),
+        Button((sign_rect.centerx + button_spacing // 2, top_row, button_width, button_height),
+               "Retry", font, (255, 140, 0), "retry"),
+        Button((sign_rect.centerx - button_width // 2, sign_rect.bottom - button_height - 90, button_width, button_height),
+               "Home", font, (0, 255, 0), "home"),  # Just above the bottom edge
     )
 
-    button2_rect = pygame.Rect(
-        sign_rect.centerx - button_width // 2,
-        sign_rect.bottom - button_height - 90,  # Just above the bottom edge
-        button_width,
-        button_height,
-    )
-
-    # Blur background
-    blurred_bg = blur_surface(screen.copy(), 10)
-
-    while running:
-        # Render the blurred background
-        screen.blit(blurred_bg, (0, 0))
-
-        # Draw the sign
-        screen.blit(sign_image, sign_rect.topleft)
-
-        # Draw "Game Over" text
-        game_over_text = font.render("GAME OVER", True, (0, 0, 0))
-        game_over_rect = game_over_text.get_rect(center=(sign_rect.centerx, sign_rect.top + 30))
-        screen.blit(game_over_text, game_over_rect)
-
-        # Draw buttons
-        pygame.draw.rect(screen, (255, 0, 0), button1_rect)  # Restart button
-        pygame.draw.rect(screen, (0, 255, 0), button2_rect)  # Button 2
-
-        # Draw button text
-        button1_text = font.render("Restart", True, (255, 255, 255))
-        button1_text_rect = button1_text.get_rect(center=button1_rect.center)
-        screen.blit(button1_text, button1_text_rect)
-
-        button2_text = font.render("Home", True, (255, 255, 255))
-        button2_text_rect = button2_text.get_rect(center=button2_rect.center)
-        screen.blit(button2_text, button2_text_rect)
-
+    while True:
+        # Only the backdrop and the cached widgets are blitted while waiting for a click
+        screen.blit(backdrop, (0, 0))
+        ui.draw(screen)
         pygame.display.flip()
 
         for event in pygame.event.get():
@@ -168,23 +161,15 @@ def show_death_screen(screen, font, sign_image, window_width, window_height, PLA
                 pygame.quit()
                 exit()
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if button1_rect.collidepoint(event.pos):
-                    # Call restart_game and get the updated state
-                    updated_state = restart_game(
-                        WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_HEALTH, DOOR_SIZE, PLAYER_SIZE,
-                        OBSTACLE_COUNT, TILE_SIZE, SPACING, EDGE_BUFFER, ENEMY_COUNT, ENEMY_SIZE, building_images
-                    )
-                    return updated_state  # Return to main loop
-
-
-                elif button2_rect.collidepoint(event.pos):
+            choice = ui.handle(event)
+            if choice == "home":
+                loaders.report()  # Before handing over to the next scene
+                with tracer.span("scene switch main -> home", "scene"):
                     os.system("python home.py")
-                    pygame.quit()
-                    exit()
+                pygame.quit()
+                exit()
+            elif choice:
+                return choice  # "restart" or "retry"; back to the main loop
 
         clock.tick(30)
 
-    # Once the loop exits, return control to the main game
-    return
-
@@ -0,0 +1,64 @@
+DEFAULT_CAPACITY = 64  # Enemy records preallocated per run; the pool grows past this if a room needs more
+
+
+class EnemyPool:
+    """
+    Reusable enemy records.
+
+    Each record is a dict with a mutable [x, y] position, so movement updates
+    it in place. Records of defeated enemies and of the previous room go back
+    to the pool and are reset in place when the next room asks for enemies,
+    instead of building new dicts and tuples on every room change.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.free = [self._new() for _ in range(capacity)]
+        self.capacity = capacity
+        self.acquired = 0
+        self.reused = 0
+
+    @staticmethod
+    def _new():
+        return {"pos": [0, 0], "health": 0, "last_hit_time": 0, "speed": 0, "ai_tick": None}
+
+    def acquire(self, x, y, health, speed):
+        """An enemy record at (x, y), reset for a new room."""
+        self.acquired += 1
+        if self.free:
+            enemy = self.free.pop()
+            self.reused += 1
+        else:
+            enemy = self._new()
+        position = enemy["pos"]
+        position[0] = x
+        position[1] = y
+        enemy["health"] = health
+        enemy["last_hit_time"] = 0  # Initialize hit cooldown
+        enemy["speed"] = speed
+        enemy["ai_tick"] = None  # The AI scheduler starts it on its next tick
+        return enemy
+
+    def release(self, enemy):
+        """Return one record to the pool."""
+        self.free.append(enemy)
+
+    def release_all(self, enemies):
+        """Return every record in enemies to the pool and empty the list in place."""
+        self.free.extend(enemies)
+        enemies.clear()
+
+    def stats(self):
+        """Acquire and reuse counts; reuse_pct is the share of acquires served without allocating."""
+        return {
+            "capacity": self.capacity,
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "allocated": self.acquired - self.reused,
+            "reuse_pct": 100 * self.reused / self.acquired if self.acquired else 0.0,
+        }
+
+    def report(self):
+        """One line summary of the pool's reuse."""
+        stats = self.stats()
+        return (f"Enemy pool: {stats['acquired']} enemies spawned, {stats['reuse_pct']:.1f}% reused, "
+                f"{stats['allocated']} allocated past the initial {stats['capacity']}")
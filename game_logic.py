@@ -1,21 +1,23 @@
 import heapq
 import random
-import pygame
+from collections import deque
+from geometry import Rect, overlaps_any, sweep_move
+from enemy_pool import EnemyPool
 
 global room_count, player_health, enemies, obstacles, door_pos, player_pos, enemy_level_multiplier
 
-def generate_building_obstacles(count, tile_size, spacing, window_width, window_height, edge_buffer, building_images):
+def generate_building_obstacles(count, tile_size, spacing, window_width, window_height, edge_buffer, building_images, rng=random):
     """Generate building obstacles with random images and dimensions."""
     obstacles = []
 
     for _ in range(count):
         while True:
             # Randomly position the obstacle
-            x = random.randint(edge_buffer, window_width - edge_buffer - tile_size)
-            y = random.randint(edge_buffer, window_height - edge_buffer - tile_size)
+            x = rng.randint(edge_buffer, window_width - edge_buffer - tile_size)
+            y = rng.randint(edge_buffer, window_height - edge_buffer - tile_size)
 
             # Assign a random image
-            image = random.choice(building_images)
+            image = rng.choice(building_images)
 
             # Determine size based on the chosen skin
             if image == building_images[0]:  # Example: First skin becomes a rectangle
@@ -24,8 +26,7 @@ def generate_building_obstacles(count, tile_size, spacing, window_width, window_
                 width, height = tile_size, tile_size  # Default square
 
             # Check if this obstacle overlaps any existing obstacles
-            rect = pygame.Rect(x, y, width, height)
-            if not any(rect.colliderect(pygame.Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles):
+            if not overlaps_any(x, y, width, height, obstacles):
                 obstacles.append((x, y, width, height, image))
                 break
 
@@ -33,134 +34,87 @@ def generate_building_obstacles(count, tile_size, spacing, window_width, window_
 
 def is_on_building(player_rect, obstacles, _):
     """Check if the player is on any building."""
-    for ox, oy, width, height, _ in obstacles:
-        building_rect = pygame.Rect(ox, oy, width, height)
-        if player_rect.colliderect(building_rect):
-            return True
-    return False
+    return overlaps_any(player_rect.x, player_rect.y, player_rect.width, player_rect.height, obstacles)
 
 
-def get_valid_starting_position(obstacles, player_size, window_width, window_height, edge_buffer, tile_size):
+def get_valid_starting_position(obstacles, player_size, window_width, window_height, edge_buffer, tile_size, rng=random):
     """Generate a valid starting position for the player."""
     while True:
-        x = random.randint(edge_buffer, window_width - edge_buffer - player_size)
-        y = random.randint(edge_buffer, window_height - edge_buffer - player_size)
-        player_rect = pygame.Rect(x, y, player_size, player_size)
+        x = rng.randint(edge_buffer, window_width - edge_buffer - player_size)
+        y = rng.randint(edge_buffer, window_height - edge_buffer - player_size)
+        player_rect = Rect(x, y, player_size, player_size)
         if not is_on_building(player_rect, obstacles, tile_size):
             return [x, y]
 
-def generate_door_position_on_edge(obstacles, window_width, window_height, door_size, edge_buffer, tile_size):
+def generate_door_position_on_edge(obstacles, window_width, window_height, door_size, edge_buffer, tile_size, rng=random):
     """Generate a valid door position on the edge of the screen."""
     # Define restricted areas (health bar and sign positions)
-    health_bar_area = pygame.Rect(10, 10, 280, 80)  # Adjust based on actual health bar position and size
-    sign_area = pygame.Rect(5, window_height - 145, 200, 150)  # Adjust based on actual sign position and size
+    health_bar_area = Rect(10, 10, 280, 80)  # Adjust based on actual health bar position and size
+    sign_area = Rect(5, window_height - 145, 200, 150)  # Adjust based on actual sign position and size
 
     while True:
-        edge = random.choice(["top", "bottom", "left", "right"])
+        edge = rng.choice(["top", "bottom", "left", "right"])
         if edge == "top":
-            x, y = random.randint(edge_buffer, window_width - edge_buffer - door_size), 0
+            x, y = rng.randint(edge_buffer, window_width - edge_buffer - door_size), 0
         elif edge == "bottom":
-            x, y = random.randint(edge_buffer, window_width - edge_buffer - door_size), window_height - door_size
+            x, y = rng.randint(edge_buffer, window_width - edge_buffer - door_size), window_height - door_size
         elif edge == "left":
-            x, y = 0, random.randint(edge_buffer, window_height - edge_buffer - door_size)
+            x, y = 0, rng.randint(edge_buffer, window_height - edge_buffer - door_size)
         elif edge == "right":
-            x, y = window_width - door_size, random.randint(edge_buffer, window_height - edge_buffer - door_size)
+            x, y = window_width - door_size, rng.randint(edge_buffer, window_height - edge_buffer - door_size)
 
-        door_rect = pygame.Rect(x, y, door_size, door_size)
+        door_rect = Rect(x, y, door_size, door_size)
 
         # Ensure the door does not overlap restricted areas or obstacles
         if (
-            not any(door_rect.colliderect(pygame.Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles)
+            not any(door_rect.colliderect(Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles)
             and not door_rect.colliderect(health_bar_area)
             and not door_rect.colliderect(sign_area)
         ):
             return [x, y]
 
-def ensure_path(player_pos, door_pos, obstacles, tile_size, window_width, window_height, player_size, building_images):
+def ensure_path(player_pos, door_pos, obstacles, tile_size, window_width, window_height, player_size, building_images, rng=random):
     """Ensure there is a valid path between the player and the door."""
-    player_rect = pygame.Rect(player_pos[0], player_pos[1], player_size, player_size)
-    door_rect = pygame.Rect(door_pos[0], door_pos[1], player_size, player_size)
+    player_rect = Rect(player_pos[0], player_pos[1], player_size, player_size)
+    door_rect = Rect(door_pos[0], door_pos[1], player_size, player_size)
 
     # Regenerate obstacles until there is a clear path between player and door
     while True:
         valid_path = True
         for obstacle in obstacles:
             ox, oy, width, height, _ = obstacle
-            obstacle_rect = pygame.Rect(ox, oy, width, height)
+            obstacle_rect = Rect(ox, oy, width, height)
             if player_rect.colliderect(obstacle_rect) or door_rect.colliderect(obstacle_rect):
                 valid_path = False
                 break
         if valid_path:
             break
         obstacles = generate_building_obstacles(
-            len(obstacles), tile_size, tile_size + 20, window_width, window_height, 100, building_images
+            len(obstacles), tile_size, tile_size + 20, window_width, window_height, 100, building_images, rng
         )
 
     return obstacles
 
-def restart_game(WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_HEALTH, DOOR_SIZE, PLAYER_SIZE,
-                 OBSTACLE_COUNT, TILE_SIZE, SPACING, EDGE_BUFFER, ENEMY_COUNT, ENEMY_SIZE, building_images):
-    """
-    Reset the game to its initial state, regenerating level, enemies, and player position.
-    """
-    # Reset room count and player health
-    room_count = 0
-    player_health = PLAYER_HEALTH
-
-    # Reset enemy level multiplier
-    enemy_level_multiplier = 1
-
-    # Regenerate room obstacles
-    obstacles = generate_building_obstacles(
-        OBSTACLE_COUNT, TILE_SIZE, SPACING, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, building_images
-    )
-
-    # Reset player position
-    player_pos = get_valid_starting_position(
-        obstacles, PLAYER_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, TILE_SIZE
-    )
-
-    # Generate a new door position
-    door_pos = generate_door_position_on_edge(
-        obstacles, WINDOW_WIDTH, WINDOW_HEIGHT, DOOR_SIZE, EDGE_BUFFER, TILE_SIZE
-    )
-
-    # Generate a new set of enemies
-    enemies = generate_enemy_positions(
-        obstacles, ENEMY_COUNT, ENEMY_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT,
-        EDGE_BUFFER, TILE_SIZE, 100, enemy_level_multiplier
-    )
-
-    # Ensure a valid path between player and door
-    obstacles = ensure_path(player_pos, door_pos, obstacles, TILE_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, building_images)
-
-    # Return the updated state
-    return room_count, player_health, obstacles, player_pos, door_pos, enemies, enemy_level_multiplier
-
-
-
-
-
-def generate_enemy_positions(obstacles, enemy_count, enemy_size, window_width, window_height, edge_buffer, tile_size, enemy_health, enemy_level_multiplier):
-    """Generate initial enemy positions avoiding obstacles."""
+def generate_enemy_positions(obstacles, enemy_count, enemy_size, window_width, window_height, edge_buffer, tile_size, enemy_health, enemy_level_multiplier, rng=random, pool=None):
+    """Generate initial enemy positions avoiding obstacles, taking enemy records from pool when given."""
+    pool = pool or EnemyPool(capacity=0)
     enemies = []
 
     for _ in range(enemy_count):
         while True:
-            x = random.randint(edge_buffer, window_width - edge_buffer - enemy_size)
-            y = random.randint(edge_buffer, window_height - edge_buffer - enemy_size)
+            x = rng.randint(edge_buffer, window_width - edge_buffer - enemy_size)
+            y = rng.randint(edge_buffer, window_height - edge_buffer - enemy_size)
 
-            enemy_rect = pygame.Rect(x, y, enemy_size, enemy_size)
+            enemy_rect = Rect(x, y, enemy_size, enemy_size)
 
             # Check if the enemy overlaps with any obstacle or other enemy
-            if not any(enemy_rect.colliderect(pygame.Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles) and \
-               not any(enemy_rect.colliderect(pygame.Rect(enemy["pos"][0], enemy["pos"][1], enemy_size, enemy_size)) for enemy in enemies):
-                enemies.append({
-                    "pos": (x, y),
-                    "health": enemy_health,  # Set health dynamically based on room count
-                    "last_hit_time": 0,  # Initialize hit cooldown
-                    "speed": random.uniform(1.0, 3.0) * enemy_level_multiplier  # Random speed slower than player
-                })
+            if not any(enemy_rect.colliderect(Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles) and \
+               not any(enemy_rect.colliderect(Rect(enemy["pos"][0], enemy["pos"][1], enemy_size, enemy_size)) for enemy in enemies):
+                enemies.append(pool.acquire(
+                    x, y,
+                    enemy_health,  # Set health dynamically based on room count
+                    rng.uniform(1.0, 3.0) * enemy_level_multiplier  # Random speed slower than player
+                ))
                 break
 
     return enemies
@@ -168,30 +122,53 @@ def generate_enemy_positions(obstacles, enemy_count, enemy_size, window_width, w
 def move_enemies_toward_player(enemies, player_pos, obstacles, tile_size, grid_width, grid_height):
     """Move enemies toward the player, avoiding obstacles."""
     for enemy in enemies:
-        enemy_x, enemy_y = enemy["pos"]
-        player_x, player_y = player_pos
-
-        # Calculate direction vector
-        dx = player_x - enemy_x
-        dy = player_y - enemy_y
-
-        # Normalize direction vector to get unit step
-        distance = (dx ** 2 + dy ** 2) ** 0.5
-        if distance == 0:
-            continue  # Skip if already at the player's position
-        step_x = (dx / distance) * enemy["speed"]
-        step_y = (dy / distance) * enemy["speed"]
-
-        # Calculate new position
-        new_x = enemy_x + step_x
-        new_y = enemy_y + step_y
-
-        # Check for collisions with obstacles
-        enemy_rect = pygame.Rect(new_x, new_y, tile_size, tile_size)
-        if not any(enemy_rect.colliderect(pygame.Rect(ox, oy, ow, oh)) for ox, oy, ow, oh, _ in obstacles):
-            enemy["pos"] = (new_x, new_y)  # Update position as a new tuple
-
-
+        move_enemy_toward_player(enemy, player_pos, obstacles, tile_size)
+
+
+def move_enemy_toward_player(enemy, player_pos, obstacles, enemy_size, ticks=1):
+    """Move one enemy toward the player by ticks worth of movement, sliding along obstacles."""
+    enemy_x, enemy_y = enemy["pos"]
+    player_x, player_y = player_pos
+
+    # Calculate direction vector
+    dx = player_x - enemy_x
+    dy = player_y - enemy_y
+
+    # Normalize direction vector to get unit step
+    distance = (dx ** 2 + dy ** 2) ** 0.5
+    if distance == 0:
+        return  # Skip if already at the player's position
+    step_x = (dx / distance) * enemy["speed"] * ticks
+    step_y = (dy / distance) * enemy["speed"] * ticks
+
+    # Swept against the obstacles, so fast enemies and long catch-up moves can't pass through them
+    position = enemy["pos"]  # Updated in place, no new tuple per move
+    position[0], position[1] = sweep_move(enemy_x, enemy_y, enemy_size, enemy_size, step_x, step_y, obstacles)
+
+
+def separate_enemies(enemies, pairs, enemy_size, obstacles):
+    """Push overlapping enemy pairs apart along their shallowest axis, stopping at obstacles."""
+    for a, b in pairs:
+        ax, ay = enemies[a]["pos"]
+        bx, by = enemies[b]["pos"]
+        dx = bx - ax
+        dy = by - ay
+
+        # Resolve along the axis with the smallest overlap, half the distance each
+        overlap_x = enemy_size - abs(dx)
+        overlap_y = enemy_size - abs(dy)
+        if overlap_x < overlap_y:
+            push = overlap_x / 2 if dx >= 0 else -overlap_x / 2
+            moves = ((a, ax - push, ay), (b, bx + push, by))
+        else:
+            push = overlap_y / 2 if dy >= 0 else -overlap_y / 2
+            moves = ((a, ax, ay - push), (b, bx, by + push))
+
+        for index, new_x, new_y in moves:
+            position = enemies[index]["pos"]
+            position[0], position[1] = sweep_move(
+                position[0], position[1], enemy_size, enemy_size, new_x - position[0], new_y - position[1], obstacles
+            )
 
 
 def a_star_path(start, goal, obstacles, tile_size, grid_width, grid_height):
@@ -222,7 +199,7 @@ def a_star_path(start, goal, obstacles, tile_size, grid_width, grid_height):
             if (
                 0 <= neighbor[0] < grid_width
                 and 0 <= neighbor[1] < grid_height
-                and not is_on_building(pygame.Rect(neighbor[0] * tile_size, neighbor[1] * tile_size, tile_size, tile_size), obstacles, tile_size)
+                and not is_on_building(Rect(neighbor[0] * tile_size, neighbor[1] * tile_size, tile_size, tile_size), obstacles, tile_size)
             ):
                 tentative_g_score = g_score[current] + 1
                 if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
@@ -232,6 +209,36 @@ def a_star_path(start, goal, obstacles, tile_size, grid_width, grid_height):
                     heapq.heappush(open_set, (f_score[neighbor], neighbor))
     return []
 
+def walk_path(start, goal_rect, obstacles, size, world_width, world_height, step):
+    """
+    Breadth-first search for a size x size body walking from start until it
+    touches goal_rect, over positions step apart on a grid anchored at start.
+    Returns the positions to walk through (the last one touches goal_rect), []
+    if start already touches it, or None if the goal can't be reached.
+    """
+    start = (start[0], start[1])
+    came_from = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        x, y = current
+        if Rect(x, y, size, size).colliderect(goal_rect):
+            path = []
+            while current != start:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return path
+        for neighbor in ((x - step, y), (x + step, y), (x, y - step), (x, y + step)):
+            if neighbor in came_from:
+                continue
+            if not (0 <= neighbor[0] <= world_width - size and 0 <= neighbor[1] <= world_height - size):
+                continue
+            came_from[neighbor] = current
+            if not overlaps_any(neighbor[0], neighbor[1], size, size, obstacles):
+                queue.append(neighbor)
+    return None
+
 def heuristic(cell, goal):
     """Heuristic function: Manhattan distance."""
     return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
\ No newline at end of file
@@ -0,0 +1,161 @@
+import math
+
+
+class Rect:
+    """
+    Minimal axis-aligned rectangle for the simulation core.
+
+    Mirrors the parts of pygame.Rect the game logic uses (overlap tests,
+    edges, unpacking) so generation and stepping never import pygame. Unlike
+    pygame.Rect it keeps float coordinates instead of truncating them.
+    """
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def center(self):
+        return self.x + self.width / 2, self.y + self.height / 2
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+    def colliderect(self, other):
+        """True if the two rectangles overlap (touching edges do not count)."""
+        other_x, other_y, other_width, other_height = other
+        return (self.x < other_x + other_width and other_x < self.x + self.width
+                and self.y < other_y + other_height and other_y < self.y + self.height)
+
+    def collidelist(self, rects):
+        """Index of the first overlapping rect in rects, or -1."""
+        for index, other in enumerate(rects):
+            if self.colliderect(other):
+                return index
+        return -1
+
+    def collidepoint(self, point):
+        """True if the point lies inside the rectangle."""
+        return self.x <= point[0] < self.x + self.width and self.y <= point[1] < self.y + self.height
+
+
+def overlaps_any(x, y, width, height, boxes):
+    """True if the rectangle overlaps any (x, y, width, height, ...) tuple in boxes."""
+    for box_x, box_y, box_width, box_height, *_ in boxes:
+        if x < box_x + box_width and box_x < x + width and y < box_y + box_height and box_y < y + height:
+            return True
+    return False
+
+
+def _flush_below(edge, size):
+    """Largest start such that start + size does not pass edge in floating point."""
+    start = edge - size
+    while start + size > edge:
+        start = math.nextafter(start, -math.inf)
+    return start
+
+
+def sweep_move(x, y, width, height, dx, dy, boxes, max_slides=2):
+    """
+    Move a width x height box from (x, y) by (dx, dy) without passing through
+    any (x, y, width, height, ...) tuple in boxes, however long the move.
+
+    The box stops at the first box it would enter and slides along that
+    face with the rest of its motion, up to max_slides times. It ends exactly
+    touching the face it hit, which does not count as overlapping. Boxes it
+    already overlaps at the start are ignored so it can leave them. Returns
+    the new (x, y).
+    """
+    for _ in range(max_slides + 1):
+        if not dx and not dy:
+            break
+        hit_time = 1.0
+        hit_axis = None
+        contact = 0
+        # Bounds of the whole move; boxes outside them can't be hit
+        sweep_left = x + dx if dx < 0 else x
+        sweep_right = x + width + dx if dx > 0 else x + width
+        sweep_top = y + dy if dy < 0 else y
+        sweep_bottom = y + height + dy if dy > 0 else y + height
+        for box in boxes:
+            # Indexing instead of unpacking into *_, which builds a list per box
+            box_x = box[0]
+            box_width = box[2]
+            if box_x >= sweep_right or box_x + box_width <= sweep_left:
+                continue
+            box_y = box[1]
+            box_height = box[3]
+            if box_y >= sweep_bottom or box_y + box_height <= sweep_top:
+                continue
+            if x < box_x + box_width and box_x < x + width and y < box_y + box_height and box_y < y + height:
+                continue
+
+            # Times (as fractions of the move) at which the box enters and leaves the other along each axis
+            if dx > 0:
+                entry_x = (box_x - x - width) / dx
+                exit_x = (box_x + box_width - x) / dx
+            elif dx < 0:
+                entry_x = (box_x + box_width - x) / dx
+                exit_x = (box_x - x - width) / dx
+            elif x < box_x + box_width and box_x < x + width:
+                entry_x, exit_x = -math.inf, math.inf
+            else:
+                continue
+            if dy > 0:
+                entry_y = (box_y - y - height) / dy
+                exit_y = (box_y + box_height - y) / dy
+            elif dy < 0:
+                entry_y = (box_y + box_height - y) / dy
+                exit_y = (box_y - y - height) / dy
+            elif y < box_y + box_height and box_y < y + height:
+                entry_y, exit_y = -math.inf, math.inf
+            else:
+                continue
+
+            entry = max(entry_x, entry_y)
+            if entry < min(exit_x, exit_y) and 0 <= entry < hit_time:
+                hit_time = entry
+                if entry_x >= entry_y:
+                    hit_axis = 0
+                    contact = _flush_below(box_x, width) if dx > 0 else box_x + box_width
+                else:
+                    hit_axis = 1
+                    contact = _flush_below(box_y, height) if dy > 0 else box_y + box_height
+
+        if hit_axis is None:
+            return x + dx, y + dy
+        # Stop on the face that was hit and keep the rest of the motion along it
+        if hit_axis == 0:
+            x = contact
+            y += dy * hit_time
+            dx = 0
+            dy *= 1 - hit_time
+        else:
+            y = contact
+            x += dx * hit_time
+            dy = 0
+            dx *= 1 - hit_time
+    return x, y
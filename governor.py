@@ -0,0 +1,75 @@
+import platform
+import time
+from collections import deque
+
+QUALITY_LOG_FILE = "quality_log.txt"
+
+# Quality tiers from best to cheapest
+QUALITY_TIERS = [
+    {"name": "high", "door_animation": True, "distant_enemy_interval": 1, "render_scale": 1.0, "smooth_scaling": True},
+    {"name": "medium", "door_animation": False, "distant_enemy_interval": 2, "render_scale": 1.0, "smooth_scaling": True},
+    {"name": "low", "door_animation": False, "distant_enemy_interval": 3, "render_scale": 0.75, "smooth_scaling": True},
+    {"name": "lowest", "door_animation": False, "distant_enemy_interval": 4, "render_scale": 0.5, "smooth_scaling": False},
+]
+
+
+class QualityGovernor:
+    """
+    Step rendering quality down when recent frames blow the budget, and back up
+    when there is sustained headroom.
+
+    Frame times should be the work done per frame (excluding the clock's sleep),
+    e.g. Clock.get_rawtime(). Every change is printed and appended to
+    QUALITY_LOG_FILE together with the machine name.
+    """
+
+    def __init__(self, budget_ms, window=30, downgrade_ratio=0.9, upgrade_ratio=0.5,
+                 upgrade_after=90, log_file=QUALITY_LOG_FILE):
+        self.budget_ms = budget_ms
+        self.frame_times = deque(maxlen=window)
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_after = upgrade_after
+        self.log_file = log_file
+        self.tier_index = 0
+        self.frames_since_change = 0
+        self.changes = []
+
+    @property
+    def tier(self):
+        """The settings of the current quality tier."""
+        return QUALITY_TIERS[self.tier_index]
+
+    def record_frame(self, frame_ms):
+        """Add one frame's work time; may change the tier. Returns True when it did."""
+        self.frame_times.append(frame_ms)
+        self.frames_since_change += 1
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        if average > self.budget_ms * self.downgrade_ratio and self.tier_index < len(QUALITY_TIERS) - 1:
+            self._set_tier(self.tier_index + 1, average)
+            return True
+        if (average < self.budget_ms * self.upgrade_ratio and self.tier_index > 0
+                and self.frames_since_change >= self.upgrade_after):
+            self._set_tier(self.tier_index - 1, average)
+            return True
+        return False
+
+    def _set_tier(self, tier_index, average):
+        previous = self.tier["name"]
+        self.tier_index = tier_index
+        self.frames_since_change = 0
+        self.frame_times.clear()  # Judge the new tier on its own frames
+
+        message = (f"{time.strftime('%Y-%m-%d %H:%M:%S')} {platform.node()} quality {previous} -> "
+                   f"{self.tier['name']} (avg frame {average:.1f}ms, budget {self.budget_ms:.1f}ms)")
+        self.changes.append(message)
+        print(message)
+        if self.log_file:
+            try:
+                with open(self.log_file, "a") as file:
+                    file.write(message + "\n")
+            except OSError as e:
+                print(f"Error writing quality log: {e}")
@@ -1,5 +1,11 @@
+import startup_trace  # First, so startup tracing sees every import
 import pygame
 import os
+import loaders
+import render_target
+import tracer
+from functools import lru_cache
+from animation import Animator
 
 # Constants
 WINDOW_WIDTH = 1200
@@ -41,9 +47,9 @@ def load_player_skins(addiction):
 
     try:
         return {
-            "idle": pygame.image.load(skins["idle"]),
-            "move_right": pygame.image.load(skins["move_right"]),
-            "move_left": pygame.image.load(skins["move_left"]),
+            "idle": loaders.load_image(skins["idle"]),
+            "move_right": loaders.load_image(skins["move_right"]),
+            "move_left": loaders.load_image(skins["move_left"]),
         }
     except pygame.error as e:
         print(f"Error loading player skins: {e}")
@@ -61,12 +67,21 @@ def get_addiction_from_data(file_path="player_data.txt"):
     except FileNotFoundError:
         return "Default"  # Default addiction if the file is missing
 
+@lru_cache(maxsize=None)
+def load_text_bubble(size1, size2):
+    """Load and scale the text bubble PNG once per size."""
+    text_bubble_image = loaders.load_image(TEXT_BUBBLE_IMAGE)
+    return loaders.scale(text_bubble_image, (size1, size2))
+
+@lru_cache(maxsize=None)
+def load_bubble_font():
+    """Load the text bubble font on first use."""
+    return pygame.font.Font(CUSTOM_FONT_PATH, 9)  # Adjust the font size if needed
+
 def draw_text_bubble(screen, text, position, size1, size2, delta1, delta2):
     """Draws a text bubble using a PNG image and renders multiline text on it."""
-    # Load the text bubble PNG
-    text_bubble_image = pygame.image.load(TEXT_BUBBLE_IMAGE)
-    text_bubble_image = pygame.transform.scale(text_bubble_image, (size1, size2))  # Scale the bubble
-    font = pygame.font.Font(CUSTOM_FONT_PATH, 9)  # Adjust the font size if needed
+    text_bubble_image = load_text_bubble(size1, size2)
+    font = load_bubble_font()
 
     # Split the text into lines
     lines = text.split("\n")
@@ -84,15 +99,34 @@ def draw_text_bubble(screen, text, position, size1, size2, delta1, delta2):
 
 def main():
     pygame.init()
+    loaders.set_scene("home")
+    tracer.set_scene("home")
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Home Scene")
     clock = pygame.time.Clock()
 
+    # The room is drawn at the internal resolution (if one is set) and upscaled; text bubbles stay full size
+    scale = render_target.internal_render_scale(
+        os.environ.get(render_target.INTERNAL_RESOLUTION_ENV), (WINDOW_WIDTH, WINDOW_HEIGHT)
+    )
+    target = screen if scale == 1 else pygame.Surface((int(WINDOW_WIDTH * scale), int(WINDOW_HEIGHT * scale)))
+
+    def scaled_size(width, height):
+        return int(width * scale), int(height * scale)
+
+    def to_target(x, y):
+        return int(x * scale), int(y * scale)
+
     # Load assets
-    background_image = pygame.image.load(BACKGROUND_IMAGE_PATH)
-    background_image = pygame.transform.scale(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
-    portal_frames = [pygame.transform.scale(pygame.image.load(img), (PORTAL_SIZE, PORTAL_SIZE)) for img in PORTAL_IMAGES]
-    new_character_image = pygame.transform.scale(pygame.image.load(NEW_CHARACTER_IMAGE_PATH), NEW_CHARACTER_SIZE)
+    background_image = loaders.load_image(BACKGROUND_IMAGE_PATH)
+    background_image = loaders.scale(background_image, target.get_size())
+    portal_animator = Animator(
+        {"open": [loaders.load_image(img) for img in PORTAL_IMAGES]},
+        size=scaled_size(PORTAL_SIZE, PORTAL_SIZE),
+        frame_durations={"open": 1000},  # Milliseconds between portal frames
+        mirror=False,
+    )
+    new_character_image = loaders.scale(loaders.load_image(NEW_CHARACTER_IMAGE_PATH), scaled_size(*NEW_CHARACTER_SIZE))
 
     # Positions and hitboxes
     player_pos = list(PLAYER_START_POS)
@@ -106,20 +140,16 @@ def main():
     # Load player skins based on addiction
     player_skins = load_player_skins(addiction)
 
-    # Scale player skins
-    player_idle_image = pygame.transform.scale(player_skins["idle"], (PLAYER_SIZE, PLAYER_SIZE))
-    player_move_frames = [
-        pygame.transform.scale(player_skins["move_right"], (PLAYER_SIZE, PLAYER_SIZE)),
-        pygame.transform.scale(player_skins["move_left"], (PLAYER_SIZE, PLAYER_SIZE)),
-    ]
-
-    # Animation and state variables
-    portal_animation_index = 0
-    portal_animation_timer = pygame.time.get_ticks()
-    portal_animation_delay = 1000  # Milliseconds between portal frames
-    player_animation_index = 0
-    player_animation_timer = pygame.time.get_ticks()
-    player_animation_delay = 500
+    # Scaled and mirrored player frames, built once
+    player_animator = Animator(
+        {
+            "idle": [player_skins["idle"]],
+            "walk": [player_skins["move_right"], player_skins["move_left"]],
+        },
+        size=scaled_size(PLAYER_SIZE, PLAYER_SIZE),
+        frame_durations={"walk": 500},
+    )
+    del player_skins  # Release the full-resolution originals once the frame tables exist
     player_facing_left = False
 
     running = True
@@ -147,14 +177,8 @@ def main():
             player_pos[1] += 5
             moving = True
 
-        # Update animations
-        if moving and current_time - player_animation_timer > player_animation_delay:
-            player_animation_index = (player_animation_index + 1) % len(player_move_frames)
-            player_animation_timer = current_time
-
-        if current_time - portal_animation_timer > portal_animation_delay:
-            portal_animation_index = (portal_animation_index + 1) % len(portal_frames)
-            portal_animation_timer = current_time
+        # Update animations (the art faces left, so facing right uses the mirrored frames)
+        player_animator.update("walk" if moving else "idle", "left" if player_facing_left else "right", current_time)
 
         # Check for collisions
         player_rect = pygame.Rect(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
@@ -163,24 +187,21 @@ def main():
 
         # Check for portal collision
         if player_rect.colliderect(portal_hitbox_rect):
+            loaders.report("home")
             pygame.quit()
-            os.system("python main.py")  # Adjust the command if needed
+            with tracer.span("scene switch home -> main", "scene"):
+                os.system("python main.py")  # Adjust the command if needed
             return
 
         # Draw the room
-        screen.blit(background_image, (0, 0))
-        screen.blit(portal_frames[portal_animation_index], (PORTAL_POS[0], PORTAL_POS[1]))
-        screen.blit(new_character_image, NEW_CHARACTER_POS)
-
-        if moving:
-            player_image = player_move_frames[player_animation_index]
-        else:
-            player_image = player_idle_image
-
-        if not player_facing_left:  # Flip the image when facing right
-            player_image = pygame.transform.flip(player_image, True, False)
+        target.blit(background_image, (0, 0))
+        target.blit(portal_animator.image(current_time), to_target(PORTAL_POS[0], PORTAL_POS[1]))
+        target.blit(new_character_image, to_target(*NEW_CHARACTER_POS))
 
-        screen.blit(player_image, (player_pos[0], player_pos[1]))
+        player_image = player_animator.image(current_time)
+        target.blit(player_image, to_target(player_pos[0], player_pos[1]))
+        if target is not screen:
+            render_target.present(target, screen)
 
         # Show text bubble interactions
         if near_computer:
@@ -196,8 +217,10 @@ def main():
                              1200, 600, 220, 185)
 
         pygame.display.flip()
+        startup_trace.first_frame("home")
         clock.tick(30)
 
+    loaders.report("home")
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+import pygame
+
+_UNDRAWN = object()  # Value of a widget that hasn't been drawn yet
+
+
+class HudWidget:
+    """One HUD element cached on its own surface and redrawn only when its value changes."""
+
+    __slots__ = ("position", "surface", "render", "value")
+
+    def __init__(self, position, size, render):
+        self.position = position
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.render = render  # render(surface, value) draws the widget at (0, 0)
+        self.value = _UNDRAWN
+
+    def update(self, value):
+        """Redraw the cached surface if value differs from the one last drawn. Returns True if it was redrawn."""
+        if value == self.value:
+            return False
+        self.surface.fill((0, 0, 0, 0))
+        self.render(self.surface, value)
+        self.value = value
+        return True
+
+
+class HudLayer:
+    """
+    The HUD as a set of named widgets composited onto the screen each frame.
+
+    Widgets keep their rendered surface between frames, so a frame costs one
+    blit per widget; text rendering and fills only happen when a widget's
+    value changes (a hit, a new room, a new high score). Each widget has its
+    own surface rather than sharing one screen-sized layer, which would be
+    mostly transparent and cost more to blit than the widgets themselves.
+    """
+
+    def __init__(self):
+        self.widgets = {}
+        self.rebuilds = 0
+
+    def add(self, name, position, size, render):
+        """Add a widget of size at position; render(surface, value) draws it from the value passed to draw()."""
+        self.widgets[name] = HudWidget(position, size, render)
+
+    def draw(self, screen, **values):
+        """Blit every widget, first redrawing those whose value (keyword named after the widget) changed."""
+        for name, value in values.items():
+            if self.widgets[name].update(value):
+                self.rebuilds += 1
+        screen.blits([(widget.surface, widget.position) for widget in self.widgets.values()], False)
@@ -0,0 +1,104 @@
+import time
+from collections import deque
+
+import pygame
+
+import simulation
+
+LATENCY_SAMPLES = 600  # Most recent input-to-present measurements kept for the stats
+
+# Keyboard keys the game reads, mapped to simulation input bits
+KEY_BITS = (
+    (pygame.K_LEFT, simulation.INPUT_LEFT),
+    (pygame.K_RIGHT, simulation.INPUT_RIGHT),
+    (pygame.K_UP, simulation.INPUT_UP),
+    (pygame.K_DOWN, simulation.INPUT_DOWN),
+    (pygame.K_SPACE, simulation.INPUT_ATTACK),
+)
+
+
+def read_input_bits(keys):
+    """Convert pygame's pressed-key state into a simulation input bitmask."""
+    inputs = 0
+    for key, bit in KEY_BITS:
+        if keys[key]:
+            inputs |= bit
+    return inputs
+
+
+class InputSnapshot:
+    """Everything the game reads about input for one frame, collected at one point in time."""
+
+    __slots__ = ("bits", "events", "quit", "time")
+
+    def __init__(self, bits, events, quit, time):
+        self.bits = bits  # simulation INPUT_* bitmask of the keys held
+        self.events = events  # Every event drained this frame, for scene-specific handling
+        self.quit = quit  # True if the window was closed
+        self.time = time  # perf_counter milliseconds at which the snapshot was taken
+
+
+class InputLayer:
+    """
+    Drain the event queue once per frame into an InputSnapshot and measure how
+    long each new input takes to reach the screen.
+
+    Call poll() at the top of the frame and presented() right after the display
+    flip. An input counts from the poll that first sees it (a key press or
+    release, a click): SDL does not give pygame the time an event was queued,
+    so the figures leave out the wait in the queue before the poll, which is
+    at most one frame.
+    """
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.latencies = deque(maxlen=samples)
+        self.previous_bits = 0
+        self.pending_since = None  # Time of the oldest input not yet on screen
+
+    def poll(self):
+        """Read all input for this frame."""
+        events = pygame.event.get()
+        now = time.perf_counter() * 1000
+        bits = read_input_bits(pygame.key.get_pressed())
+        quit = False
+        for event in events:
+            if event.type == pygame.QUIT:
+                quit = True
+
+        new_input = bits != self.previous_bits or any(
+            event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN) for event in events
+        )
+        if new_input and self.pending_since is None:
+            self.pending_since = now
+        self.previous_bits = bits
+        return InputSnapshot(bits, events, quit, now)
+
+    def presented(self):
+        """Call after the display flip; closes the latency measurement of pending input."""
+        if self.pending_since is not None:
+            self.latencies.append(time.perf_counter() * 1000 - self.pending_since)
+            self.pending_since = None
+
+    def discard(self):
+        """Drop pending input, e.g. after a blocking scene such as the death screen took over."""
+        self.pending_since = None
+        self.previous_bits = 0
+
+    def stats(self):
+        """Input-to-present latency over the recent samples, in milliseconds."""
+        if not self.latencies:
+            return {"samples": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "samples": count,
+            "mean_ms": sum(ordered) / count,
+            "p95_ms": ordered[min(count - 1, int(count * 0.95))],
+            "max_ms": ordered[-1],
+        }
+
+    def report(self):
+        """One line summary of the latency stats."""
+        stats = self.stats()
+        return (f"Input latency over {stats['samples']} inputs: mean {stats['mean_ms']:.1f}ms, "
+                f"p95 {stats['p95_ms']:.1f}ms, max {stats['max_ms']:.1f}ms")
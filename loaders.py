@@ -0,0 +1,171 @@
+import atexit
+import os
+import time
+import weakref
+
+import pygame
+
+import tracer
+
+# Opt-in sprite memory accounting: set HABITS_SURFACE_REPORT=1 (child scenes
+# inherit it) and each scene writes a report of the Surfaces it holds on exit.
+ENABLED = os.environ.get("HABITS_SURFACE_REPORT", "") not in ("", "0")
+SPRITE_BUDGET_MB = float(os.environ.get("HABITS_SPRITE_BUDGET_MB", "32"))
+SURFACE_REPORT_FILE = "surface_report.txt"
+REPORTED_SURFACES = 10  # Largest surfaces listed in the report
+
+_records = {}  # id(surface) -> record of a live tracked surface
+_scene = "startup"
+_report_registered = False
+_reported = False
+_live_bytes = 0
+_peak_bytes = 0
+
+
+def set_scene(scene):
+    """
+    Name the scene that owns surfaces created from now on. Scenes call report()
+    when they end; as a fallback it also runs when the process exits.
+    """
+    global _scene, _report_registered
+    _scene = scene
+    if ENABLED and not _report_registered:
+        atexit.register(report)
+        _report_registered = True
+
+
+def _forget(key):
+    """Weakref callback: a tracked surface was freed."""
+    global _live_bytes
+    record = _records.pop(key, None)
+    if record:
+        _live_bytes -= record["bytes"]
+
+
+def track(surface, label, kind="derived", speculative=False):
+    """
+    Account for a surface. Speculative surfaces are variants built ahead of
+    need (mirrored frames, cached effects); the report lists those never drawn.
+    Returns the surface.
+    """
+    global _live_bytes, _peak_bytes
+    if not ENABLED or not isinstance(surface, pygame.Surface):
+        return surface
+    key = id(surface)
+    if key in _records:
+        return surface
+    _records[key] = {
+        "ref": weakref.ref(surface, lambda _, key=key: _forget(key)),
+        "label": label,
+        "kind": kind,
+        "scene": _scene,
+        "size": surface.get_size(),
+        "bytes": surface.get_pitch() * surface.get_height(),
+        "speculative": speculative,
+        "used": False,
+    }
+    _live_bytes += _records[key]["bytes"]
+    _peak_bytes = max(_peak_bytes, _live_bytes)
+    return surface
+
+
+def label_of(surface):
+    """The tracked label of a surface, or a description of it."""
+    record = _records.get(id(surface))
+    if record:
+        return record["label"]
+    width, height = surface.get_size()
+    return f"surface {width}x{height}"
+
+
+def mark_used(surface):
+    """Note that a speculative variant was actually drawn."""
+    if ENABLED:
+        record = _records.get(id(surface))
+        if record:
+            record["used"] = True
+
+
+def load_image(path):
+    """
+    pygame.image.load, accounted for. Once a window is open the image is
+    converted to the display's pixel format; blitting an unconverted image
+    converts every pixel on every blit.
+    """
+    with tracer.span("load image", "assets", path=path):
+        surface = pygame.image.load(path)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return track(surface, path, "load")
+
+
+def scale(surface, size, speculative=False):
+    """pygame.transform.scale, accounted for as a variant of surface."""
+    result = pygame.transform.scale(surface, size)
+    if ENABLED:
+        track(result, f"{label_of(surface)} scaled {size[0]}x{size[1]}", "scaled", speculative)
+    return result
+
+
+def flip(surface, flip_x=True, flip_y=False, speculative=False):
+    """pygame.transform.flip, accounted for as a variant of surface."""
+    result = pygame.transform.flip(surface, flip_x, flip_y)
+    if ENABLED:
+        track(result, f"{label_of(surface)} mirrored", "mirrored", speculative)
+    return result
+
+
+def report(scene=None):
+    """
+    Print and append to SURFACE_REPORT_FILE the memory held by live tracked
+    surfaces: totals per scene and kind, the largest surfaces, duplicates
+    (same label and size held more than once) and speculative variants that
+    were never drawn. Warns when the total or the peak exceeds SPRITE_BUDGET_MB.
+    Only the first call per process reports.
+    """
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    scene = scene or _scene
+    records = [record for record in _records.values() if record["ref"]() is not None]
+    total = sum(record["bytes"] for record in records)
+    budget = SPRITE_BUDGET_MB * 2 ** 20
+
+    lines = [f"[surfaces] {scene}: {len(records)} surfaces, {total / 2 ** 20:.2f}MB, "
+             f"peak {_peak_bytes / 2 ** 20:.2f}MB (budget {SPRITE_BUDGET_MB:.1f}MB)"]
+    if max(total, _peak_bytes) > budget:
+        lines.append(f"[surfaces] {scene}: WARNING sprite memory over budget by "
+                     f"{(max(total, _peak_bytes) - budget) / 2 ** 20:.2f}MB")
+
+    by_group = {}
+    for record in records:
+        group = (record["scene"], record["kind"])
+        count, size = by_group.get(group, (0, 0))
+        by_group[group] = (count + 1, size + record["bytes"])
+    for (owner, kind), (count, size) in sorted(by_group.items()):
+        lines.append(f"[surfaces] {scene}:   {owner}/{kind}: {count} surfaces, {size / 1024:.0f}KB")
+
+    for record in sorted(records, key=lambda record: record["bytes"], reverse=True)[:REPORTED_SURFACES]:
+        width, height = record["size"]
+        lines.append(f"[surfaces] {scene}:   {record['bytes'] / 1024:.0f}KB {width}x{height} {record['label']}")
+
+    duplicates = {}
+    for record in records:
+        duplicates.setdefault((record["label"], record["size"]), []).append(record)
+    for (label, _), copies in sorted(duplicates.items()):
+        if len(copies) > 1:
+            wasted = sum(record["bytes"] for record in copies[1:])
+            lines.append(f"[surfaces] {scene}:   duplicate x{len(copies)} {label} ({wasted / 1024:.0f}KB extra)")
+
+    unused = [record for record in records if record["speculative"] and not record["used"]]
+    for record in sorted(unused, key=lambda record: record["label"]):
+        lines.append(f"[surfaces] {scene}:   unused variant {record['label']} ({record['bytes'] / 1024:.0f}KB)")
+
+    text = "\n".join(lines)
+    print(text)
+    try:
+        with open(SURFACE_REPORT_FILE, "a") as file:
+            file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{text}\n")
+    except OSError as e:
+        print(f"Error writing surface report: {e}")
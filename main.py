@@ -1,30 +1,33 @@
+import startup_trace  # First, so startup tracing sees every import
+import argparse
+import os
 import pygame
-from game_logic import (
-    generate_building_obstacles,
-    generate_door_position_on_edge,
-    get_valid_starting_position,
-    generate_enemy_positions,
-    move_enemies_toward_player,
-    ensure_path,
-)
+import loaders
 from display import load_health_bar_assets, display_health_bar, draw_obstacles, display_room_count, display_high_score, \
-    display_health, load_font, display_sign, show_death_screen
+    display_health, load_font, display_sign, show_death_screen, draw_background, scaled_sprite
+import broadphase
+from animation import Animator
+from bot import Bot
+from camera import Camera
+from capture import CAPTURE_ENV, FrameCapture
+from governor import QualityGovernor
+from hud import HudLayer
+from input_layer import InputLayer
+from persistence import PersistenceWorker
+import postfx
+import render_target
+import replay
+import simulation
+from room_library import ROOM_LIBRARY_FILE, open_library
+import tracer
+from simulation import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, ENEMY_SIZE, TILE_SIZE, DOOR_SIZE, SPACING, OBSTACLE_COUNT,
+    EDGE_BUFFER, ENEMY_COUNT, PLAYER_HEALTH, DAMAGE_COOLDOWN, HIT_ANIMATION_DURATION, IDLE_THRESHOLD, FPS,
+)
 
 # Constants
-WINDOW_WIDTH = 1200
-WINDOW_HEIGHT = 800
-PLAYER_SIZE = 50
-ENEMY_SIZE = 50
-TILE_SIZE = 115
-DOOR_SIZE = 100
-SPACING = 250
-OBSTACLE_COUNT = 8
-EDGE_BUFFER = 150
-ENEMY_COUNT = 5
-PLAYER_HEALTH = 100
 ROOM_COUNT_FILE = "room_count.txt"
-DAMAGE_COOLDOWN = 1000  # Milliseconds
-HIT_ANIMATION_DURATION = 200  # Duration for player hit animation in milliseconds
+DISTANT_ENEMY_RANGE = 600  # Enemies farther than this from the player may be redrawn less often
 
 HEALTH_COLOR = (255, 255, 255)
 
@@ -62,10 +65,10 @@ def load_enemy_skin(addiction, base_path="assets/enemies/"):
 
     skin_path = addiction_skins.get(addiction, addiction_skins["Default"])
     try:
-        return pygame.image.load(skin_path)
+        return loaders.load_image(skin_path)
     except pygame.error:
         print(f"Error: Could not load skin for addiction '{addiction}'. Falling back to default.")
-        return pygame.image.load(addiction_skins["Default"])
+        return loaders.load_image(addiction_skins["Default"])
 
 def load_player_skins(addiction, base_path="assets/player/"):
     """
@@ -88,10 +91,10 @@ def load_player_skins(addiction, base_path="assets/player/"):
 
     try:
         return {
-            "idle": pygame.image.load(skins["idle"]),
-            "move_right": pygame.image.load(skins["move_right"]),
-            "move_left": pygame.image.load(skins["move_left"]),
-            "attack": pygame.image.load(skins["attack"]),
+            "idle": loaders.load_image(skins["idle"]),
+            "move_right": loaders.load_image(skins["move_right"]),
+            "move_left": loaders.load_image(skins["move_left"]),
+            "attack": loaders.load_image(skins["attack"]),
         }
     except pygame.error as e:
         print(f"Error loading player skins: {e}")
@@ -117,28 +120,42 @@ def load_high_score(file_path):
     except (FileNotFoundError, ValueError):
         return 0
 
-def save_high_score(file_path, high_score):
-    with open(file_path, "w") as file:
-        file.write(f"0 {high_score}")
-
-def main():
+def main(record_path=None, replay_path=None, speed=1.0, seed=None,
+         world_size=(WINDOW_WIDTH, WINDOW_HEIGHT), obstacle_density=1.0, enemy_density=1.0, internal_resolution=None,
+         room_library_path=ROOM_LIBRARY_FILE, bot=False, capture_path=None, capture_encoder=None):
+    """
+    Run the game.
+
+    record_path writes the run's seed and per-tick input to a replay file;
+    replay_path plays one back instead of reading the keyboard, at speed times
+    real time (0 means uncapped); bot does the same with the scripted player
+    from bot.py, seeded with the run's seed and with starting stats, and ends at its first death. world_size larger than the window gives a
+    scrolling room; only what is inside the camera's viewport is drawn.
+    internal_resolution (e.g. "600x400") draws the world at that size and
+    upscales it by a whole factor; the HUD is still drawn at full resolution.
+    Rooms are picked from the layout library at room_library_path when it
+    exists (see room_library.py) and generated on the fly otherwise.
+    capture_path or capture_encoder records every presented frame (see
+    capture.py) without making the frame wait for the writer.
+    """
     pygame.init()
+    loaders.set_scene("main")
+    tracer.set_scene("main")
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Room Counter Game")
     font = load_font()
     health_bar_base = load_health_bar_assets()
-    sign_image = pygame.image.load("assets/others/sign.png")
-    sign_image = pygame.transform.scale(sign_image, (200, 150))
+    sign_image = loaders.load_image("assets/others/sign.png")
+    sign_image = loaders.scale(sign_image, (200, 150))
+    frame_capture = FrameCapture(screen, capture_path, capture_encoder, FPS) if capture_path or capture_encoder else None
+    startup_trace.mark("window open")
 
-    addiction = get_addiction_from_data()
     # Load images
-    background_image = pygame.image.load("assets/scene/better_background.png")
-    door_image1 = pygame.image.load("assets/others/portaljos.png")
-    door_image2 = pygame.image.load("assets/others/portalsus.png")
+    background_image = loaders.load_image("assets/scene/better_background.png")
     building_images = [
-        pygame.image.load("assets/others/building1.png"),
-        pygame.image.load("assets/others/building2.png"),
-        pygame.image.load("assets/others/building3.png")
+        loaders.load_image("assets/others/building1.png"),
+        loaders.load_image("assets/others/building2.png"),
+        loaders.load_image("assets/others/building3.png")
     ]
 
     # Load addiction type
@@ -147,245 +164,300 @@ def main():
     # Load player skins based on addiction
     player_skins = load_player_skins(addiction)
 
-    # Scale skins as needed
-    player_image_idle = pygame.transform.scale(player_skins["idle"], (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image1 = pygame.transform.scale(player_skins["move_right"], (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image2 = pygame.transform.scale(player_skins["move_left"], (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image_hit = pygame.transform.scale(player_skins["attack"], (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
+    # Every scaled and mirrored player frame is built once here
+    player_animator = Animator(
+        {
+            "idle": [player_skins["idle"]],
+            "walk": [player_skins["move_right"], player_skins["move_left"]],
+            "attack": [player_skins["attack"]],
+        },
+        size=(PLAYER_SIZE * 2, PLAYER_SIZE * 2),
+        frame_durations={"walk": 500},  # Toggle every 0.5 seconds
+    )
+    del player_skins  # Release the full-resolution originals once the frame tables exist
+    door_animator = Animator(
+        {"open": [loaders.load_image("assets/others/portaljos.png"), loaders.load_image("assets/others/portalsus.png")]},
+        size=(DOOR_SIZE, DOOR_SIZE),
+        frame_durations={"open": 1000},  # Toggle every 1 second
+        mirror=False,
+    )
+
+    # Scale images
+    background_image = loaders.scale(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    enemy_image = loaders.scale(load_enemy_skin(addiction), (ENEMY_SIZE, ENEMY_SIZE))
+    enemy_image_hit = postfx.hit_flash(enemy_image)
 
-    # Create mirrored versions of the player images
-    player_image1_mirror = pygame.transform.flip(player_image1, True, False)
-    player_image2_mirror = pygame.transform.flip(player_image2, True, False)
-    player_image_mirror_hit = pygame.transform.flip(player_image_hit, True, False)
-    player_image_idle_mirror = pygame.transform.flip(player_image_idle, True, False)
+    # Obstacles store a building sprite id; pre-scale each sprite to its obstacle size
+    building_images = [
+        loaders.scale(building_images[0], (TILE_SIZE, int(TILE_SIZE * 1.5))),  # First skin is a rectangle
+        loaders.scale(building_images[1], (TILE_SIZE, TILE_SIZE)),
+        loaders.scale(building_images[2], (TILE_SIZE, TILE_SIZE)),
+    ]
 
+    # Build the damage-flash variants up front so the first hit costs nothing
+    for image in player_animator.all_frames():
+        postfx.hit_flash(image)
 
-    # Scale images
-    background_image = pygame.transform.scale(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
-    player_image1 = pygame.transform.scale(player_image1, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image2 = pygame.transform.scale(player_image2, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image_idle = pygame.transform.scale(player_image_idle, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image_hit = pygame.transform.scale(player_image_hit, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image1_mirror = pygame.transform.scale(player_image1_mirror, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image2_mirror = pygame.transform.scale(player_image2_mirror, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image_idle_mirror = pygame.transform.scale(player_image_idle_mirror, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    player_image_mirror_hit = pygame.transform.scale(player_image_mirror_hit, (PLAYER_SIZE * 2, PLAYER_SIZE * 2))
-    enemy_image = pygame.transform.scale(load_enemy_skin(addiction), (ENEMY_SIZE, ENEMY_SIZE))
-    enemy_image_hit = pygame.transform.scale(enemy_image, (ENEMY_SIZE, ENEMY_SIZE))
-    door_image1 = pygame.transform.scale(door_image1, (DOOR_SIZE, DOOR_SIZE))
-    door_image2 = pygame.transform.scale(door_image2, (DOOR_SIZE, DOOR_SIZE))
-    building_images = [pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE)) for img in building_images]
-
-    room_count = 0
+    startup_trace.mark("sprites loaded")
     high_score = load_high_score(ROOM_COUNT_FILE)
+    persistence = PersistenceWorker(ROOM_COUNT_FILE)  # High score and run history are written off the game thread
 
     clock = pygame.time.Clock()
 
     running = True
 
-    player_skin_toggle = True  # Toggle state for player skin
-    last_player_skin_toggle_time = pygame.time.get_ticks()
-    last_input_time = pygame.time.get_ticks()
-    idle_threshold = 5000
-
-    door_image_toggle = True  # Toggle state
-    last_toggle_time = pygame.time.get_ticks()
-
-    value = get_amount_from_data()
-    if(value == 0):
-        player_level_multiplier = 2
+    # Either play back a recording or start a fresh (optionally recorded) run
+    recorder = None
+    replay_inputs = None
+    bot_player = None
+    if replay_path:
+        header, runs = replay.load_replay(replay_path)
+        state = simulation.new_game(header["seed"], header["amount"], header["world_size"],
+                                    header["obstacle_density"], header["enemy_density"],
+                                    room_library=replay.replay_library(header, room_library_path))
+        replay_inputs = replay.iter_inputs(runs)
     else:
-        player_level_multiplier = 1 / value + 1
-    move_speed = 7 * player_level_multiplier
-    player_health = 100 * player_level_multiplier
-    player_damage = 50 * player_level_multiplier
-    last_damage_time = 0
-    player_last_hit_time = 0  # Initialize player hit time
-    player_facing = "right"  # Default facing direction
-
-    obstacles = generate_building_obstacles(
-        OBSTACLE_COUNT, TILE_SIZE, SPACING, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, building_images
-    )
-    enemy_level_multiplier = 1
-    player_pos = get_valid_starting_position(obstacles, PLAYER_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, TILE_SIZE)
-    player_rect = pygame.Rect(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
-    door_pos = generate_door_position_on_edge(obstacles, WINDOW_WIDTH, WINDOW_HEIGHT, DOOR_SIZE, EDGE_BUFFER, TILE_SIZE)
-    enemies = generate_enemy_positions(
-        obstacles, ENEMY_COUNT, ENEMY_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, TILE_SIZE, 100, enemy_level_multiplier  # Initial health
-    )
-
-    obstacles = ensure_path(player_pos, door_pos, obstacles, TILE_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, building_images)
+        amount = 0 if bot else get_amount_from_data()  # The bot plays with starting stats, as in bot.py
+        state = simulation.new_game(seed, amount, world_size, obstacle_density, enemy_density,
+                                    room_library=open_library(room_library_path))
+        if bot:
+            bot_player = Bot(state["seed"])  # Same seed as bot.py's headless runs
+        if record_path:
+            library = state["room_library"]
+            recorder = replay.Recorder(record_path, state["seed"], amount, world_size, obstacle_density, enemy_density,
+                                       library_id=library.library_id if library else 0)
+    player_level_multiplier = state["player_level_multiplier"]
+    scripted = replay_inputs is not None or bot_player is not None  # Nobody at the keyboard
+
+    # Health bar and sign are cached and only redrawn when health, room count or high score change
+    hud = HudLayer()
+    hud.add("health", (10, 10), health_bar_base.get_size(),
+            lambda surface, health: display_health_bar(
+                surface, health, PLAYER_HEALTH, health_bar_base, (0, 0), player_level_multiplier))
+    hud.add("sign", (5, WINDOW_HEIGHT - 145), sign_image.get_size(),
+            lambda surface, scores: display_sign(surface, *scores, font, sign_image, (0, 0)))
+    startup_trace.mark("first room generated")
+
+    def record_run(outcome):
+        """Queue the current life for the run history (not for replays or bot runs)."""
+        if not scripted:
+            persistence.record_run(state["seed"], state["room_count"], state["damage_taken"] - life_damage_start,
+                                   (state["time"] - life_start_time) / 1000, outcome)
+    life_damage_start = 0
+    life_start_time = 0
+
+    # Camera and the obstacle grid used for viewport culling (rebuilt when the room changes)
+    camera = Camera(WINDOW_WIDTH, WINDOW_HEIGHT, state["world_width"], state["world_height"])
+    obstacle_grid = None
+    grid_obstacles = None
+
+    # Quality governor and the reduced-resolution world layer it (or the internal resolution) draws into
+    internal_scale = render_target.internal_render_scale(internal_resolution, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    governor = QualityGovernor(1000 / FPS)
+    world_surface = None
+    enemy_draw_positions = {}  # Last drawn position of distant enemies, keyed by id
+    frame_count = 0
+
+    # All input is read once per frame, at the top of the loop
+    input_layer = InputLayer()
 
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        keys = pygame.key.get_pressed()
-        new_player_pos = player_pos[:]
-
-        current_time = pygame.time.get_ticks()
-        idle = current_time - last_input_time > idle_threshold  # Check for idle state
-
-        if keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP] or keys[pygame.K_DOWN]:
-            last_input_time = current_time
-
-        if current_time - last_player_skin_toggle_time >= 500:  # Toggle every 0.5 seconds
-            player_skin_toggle = not player_skin_toggle
-            last_player_skin_toggle_time = current_time
-
-        # Player skin toggle logic
-        if current_time - last_player_skin_toggle_time >= 500:  # Toggle every 0.5 seconds
-            player_skin_toggle = not player_skin_toggle
-            last_player_skin_toggle_time = current_time
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        # Door skin toggle logic
-        if current_time - last_toggle_time >= 1000:  # Toggle every 1 second
-            door_image_toggle = not door_image_toggle
-            last_toggle_time = current_time
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        # Player movement logic
-        if keys[pygame.K_LEFT]:
-            new_player_pos[0] -= move_speed
-            player_facing = "left"
-        if keys[pygame.K_RIGHT]:
-            new_player_pos[0] += move_speed
-            player_facing = "right"
-        if keys[pygame.K_UP]:
-            new_player_pos[1] -= move_speed
-        if keys[pygame.K_DOWN]:
-            new_player_pos[1] += move_speed
-
-        collisions = [pygame.Rect(o[0], o[1], o[2], o[3]) for o in obstacles]
-        if pygame.Rect(new_player_pos[0], new_player_pos[1], PLAYER_SIZE, PLAYER_SIZE).collidelist(collisions) == -1:
-            player_pos = new_player_pos
-            player_rect = pygame.Rect(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
-
-        # Player attack logic
-        is_attacking = keys[pygame.K_SPACE]
-        if is_attacking and pygame.time.get_ticks() - player_last_hit_time > HIT_ANIMATION_DURATION:
-            player_last_hit_time = pygame.time.get_ticks()  # Record the time of the attack
-            attack_range = pygame.Rect(
-                player_pos[0] - 30,  # Expand left
-                player_pos[1] - 30,  # Expand upward
-                PLAYER_SIZE + 60,  # Expand width
-                PLAYER_SIZE + 60  # Expand height
-            )
-            for enemy in enemies[:]:
-                enemy_rect = pygame.Rect(enemy["pos"][0], enemy["pos"][1], ENEMY_SIZE, ENEMY_SIZE)
-                if attack_range.colliderect(enemy_rect):
-                    enemy["health"] -= player_damage
-                    if enemy["health"] <= 0:
-                        enemies.remove(enemy)
-
-        # Enemy movement logic
-        move_enemies_toward_player(
-            enemies, player_pos, obstacles, TILE_SIZE, WINDOW_WIDTH // TILE_SIZE, WINDOW_HEIGHT // TILE_SIZE
-        )
-
-        # Check for enemy collisions and apply damage
-        for enemy in enemies:
-            enemy_rect = pygame.Rect(enemy["pos"][0], enemy["pos"][1], ENEMY_SIZE, ENEMY_SIZE)
-            if player_rect.colliderect(enemy_rect):
-                if current_time - last_damage_time > DAMAGE_COOLDOWN:
-                    scaled_enemy_damage = 10 * enemy_level_multiplier  # Increase damage by 2 per room
-                    player_health -= scaled_enemy_damage
-                    last_damage_time = current_time
-                    enemy["last_hit_time"] = current_time  # Update last hit time
+        frame_start = tracer.now()
+        snapshot = input_layer.poll()
+        if snapshot.quit:
+            running = False
+
+        if replay_inputs is not None:
+            inputs = next(replay_inputs, None)
+            if inputs is None:
+                break  # End of the recording
+        else:
+            inputs = bot_player.inputs(state) if bot_player else snapshot.bits
+            if recorder:
+                recorder.record(inputs)
+        tracer.complete("input", frame_start)
+
+        with tracer.span("simulate", tick=state["tick"] + 1):
+            simulation.step(state, inputs)
 
         # Check for game over
-        if player_health <= 0:
-            # Call death screen and reset game
-            updated_state = show_death_screen(
-                screen, font, pygame.image.load("assets/others/death_menu.png"), WINDOW_WIDTH, WINDOW_HEIGHT,
-                PLAYER_HEALTH, DOOR_SIZE, PLAYER_SIZE, OBSTACLE_COUNT, TILE_SIZE, SPACING,
-                WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, building_images, ENEMY_COUNT, ENEMY_SIZE
+        if state["dead"]:
+            record_run("died")
+            if recorder:
+                # A recording covers a single life
+                recorder.close()
+                recorder = None
+            if scripted:
+                break
+
+            # Call death screen and restore the chosen room checkpoint (no regeneration)
+            death_start = tracer.now()
+            choice = show_death_screen(
+                screen, font, loaders.load_image("assets/others/death_menu.png"), WINDOW_WIDTH, WINDOW_HEIGHT
             )
-
-            # Unpack the updated state
-            room_count, player_health, obstacles, player_pos, door_pos, enemies, enemy_level_multiplier = updated_state
+            if choice == "retry":
+                simulation.retry_room(state)
+            else:
+                simulation.restart(state)
+            enemy_draw_positions.clear()
+            input_layer.discard()  # The death screen's wait is not input latency
+            tracer.complete("death screen", death_start, "scene", choice=choice)
+            life_damage_start = state["damage_taken"]
+            life_start_time = state["time"]
 
             print("Game restarted, resuming with reset state.")
             continue
 
-            # Door collision and room transition
-        door_rect = pygame.Rect(door_pos[0], door_pos[1], DOOR_SIZE, DOOR_SIZE)
-        if player_rect.colliderect(door_rect) and not enemies:
-            room_count += 1
-            enemy_level_multiplier += 0.2
-            if room_count > high_score:
-                high_score = room_count
-                save_high_score(ROOM_COUNT_FILE, high_score)
-
-            # Scale enemy stats
-            scaled_enemy_count = ENEMY_COUNT + (room_count // 3)  # Increase enemies every 3 rooms
-            scaled_enemy_health = 100 * enemy_level_multiplier   # Increase health by 10 per room
-
-            # Regenerate the room
-            obstacles = generate_building_obstacles(
-                OBSTACLE_COUNT, TILE_SIZE, SPACING, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, building_images
-            )
-            player_pos = get_valid_starting_position(obstacles, PLAYER_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, TILE_SIZE)
-            player_rect = pygame.Rect(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
-            door_pos = generate_door_position_on_edge(obstacles, WINDOW_WIDTH, WINDOW_HEIGHT, DOOR_SIZE, EDGE_BUFFER, TILE_SIZE)
-            enemies = generate_enemy_positions(
-                obstacles, scaled_enemy_count, ENEMY_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, EDGE_BUFFER, TILE_SIZE, scaled_enemy_health, enemy_level_multiplier
-            )
-            obstacles = ensure_path(player_pos, door_pos, obstacles, TILE_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, building_images)
-
-        # Rendering
-        screen.blit(background_image, (0, 0))
-        draw_obstacles(screen, obstacles)
-        for enemy in enemies:
-            if current_time - enemy["last_hit_time"] <= DAMAGE_COOLDOWN:
-                screen.blit(enemy_image_hit, (enemy["pos"][0], enemy["pos"][1]))  # Display hit skin
+        if not scripted and state["room_count"] > high_score:
+            high_score = state["room_count"]
+            persistence.save_high_score(high_score)
+
+        # Rendering uses the simulation clock so replays look the same as the original run
+        draw_start = tracer.now()
+        sim_time = state["time"]
+        player_pos = state["player_pos"]
+        player_facing = state["player_facing"]
+        enemies = state["enemies"]
+        door_pos = state["door_pos"]
+        idle = sim_time - state["last_input_time"] > IDLE_THRESHOLD  # Check for idle state
+
+        # Follow the player and only draw what intersects the viewport
+        camera.follow(player_pos[0] + PLAYER_SIZE // 2, player_pos[1] + PLAYER_SIZE // 2)
+        viewport = camera.viewport
+        offset = (camera.x, camera.y)
+        if grid_obstacles is not state["obstacles"]:
+            grid_obstacles = state["obstacles"]
+            obstacle_grid = broadphase.SpatialGrid(grid_obstacles, TILE_SIZE * 2)
+            enemy_draw_positions.clear()
+
+        # The world is drawn at the internal resolution or the governor's render scale, whichever is
+        # lower, and scaled up onto the screen
+        quality = governor.tier
+        scale = min(quality["render_scale"], internal_scale)
+        if scale == 1:
+            target = screen
+        else:
+            layer_size = (int(WINDOW_WIDTH * scale), int(WINDOW_HEIGHT * scale))
+            if world_surface is None or world_surface.get_size() != layer_size:
+                world_surface = pygame.Surface(layer_size)
+            target = world_surface
+
+        def to_target(x, y):
+            screen_x, screen_y = camera.to_screen(x, y)
+            return screen_x * scale, screen_y * scale
+
+        draw_background(target, scaled_sprite(background_image, scale), (int(offset[0] * scale), int(offset[1] * scale)))
+        draw_obstacles(target, obstacle_grid.query(viewport), [scaled_sprite(image, scale) for image in building_images],
+                       offset, scale)
+        frame_count += 1
+        interval = quality["distant_enemy_interval"]
+        enemy_index = state["enemy_index"]
+        if enemy_index is None or enemy_index.enemies is not enemies:
+            enemy_index = broadphase.SweepIndex(enemies, ENEMY_SIZE)  # Enemies died or the room changed this tick
+        for index in enemy_index.query(viewport):
+            enemy = enemies[index]
+            enemy_pos = enemy["pos"]
+            if interval > 1 and abs(enemy_pos[0] - player_pos[0]) + abs(enemy_pos[1] - player_pos[1]) > DISTANT_ENEMY_RANGE:
+                # Distant enemies only move on screen every few frames
+                if id(enemy) not in enemy_draw_positions or (frame_count + index) % interval == 0:
+                    enemy_draw_positions[id(enemy)] = (enemy_pos[0], enemy_pos[1])
+                enemy_pos = enemy_draw_positions[id(enemy)]
+            if enemy["last_hit_time"] and sim_time - enemy["last_hit_time"] <= DAMAGE_COOLDOWN:
+                target.blit(scaled_sprite(enemy_image_hit, scale), to_target(enemy_pos[0], enemy_pos[1]))  # Display hit skin
             else:
-                screen.blit(enemy_image, (enemy["pos"][0], enemy["pos"][1]))
+                target.blit(scaled_sprite(enemy_image, scale), to_target(enemy_pos[0], enemy_pos[1]))
 
         if idle:
-            # Render special idle skin
-            if player_facing == "left":
-                screen.blit(player_image_idle, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-            else:
-                screen.blit(player_image_idle_mirror, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
+            player_state = "idle"  # Render special idle skin
+        elif state["player_last_hit_time"] and sim_time - state["player_last_hit_time"] <= HIT_ANIMATION_DURATION:
+            player_state = "attack"
         else:
-            if current_time - player_last_hit_time <= HIT_ANIMATION_DURATION:
-                if player_facing == "left":
-                    screen.blit(player_image_hit, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-                else:
-                    screen.blit(player_image_mirror_hit, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-            else:
-                # Render idle skin
-                if player_facing == "left":
-                    if player_skin_toggle:
-                        screen.blit(player_image1, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-                    else:
-                        screen.blit(player_image2, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-                else:
-                    if player_skin_toggle:
-                        screen.blit(player_image1_mirror, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
-                    else:
-                        screen.blit(player_image2_mirror, (player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
+            player_state = "walk"
+        player_animator.update(player_state, player_facing, sim_time)
+        player_image = player_animator.image(sim_time)
+
+        # Flash the player red after taking damage (tinted variants are built once and cached)
+        if state["last_damage_time"] and sim_time - state["last_damage_time"] <= HIT_ANIMATION_DURATION:
+            player_image = postfx.hit_flash(player_image)
+        target.blit(scaled_sprite(player_image, scale), to_target(player_pos[0] - PLAYER_SIZE, player_pos[1] - PLAYER_SIZE))
 
         if not enemies:
-            if door_image_toggle:
-                screen.blit(door_image1, (door_pos[0], door_pos[1]))
+            door_image = door_animator.image(sim_time if quality["door_animation"] else 0)
+            target.blit(scaled_sprite(door_image, scale), to_target(door_pos[0], door_pos[1]))
+
+        if target is not screen:
+            if scale == internal_scale:
+                render_target.present(world_surface, screen)  # Whole-number factor, pixels stay square
+            elif quality["smooth_scaling"]:
+                pygame.transform.smoothscale(world_surface, (WINDOW_WIDTH, WINDOW_HEIGHT), screen)
             else:
-                screen.blit(door_image2, (door_pos[0], door_pos[1]))
-        display_health_bar(screen, player_health, PLAYER_HEALTH, health_bar_base, (10, 10), player_level_multiplier)
-        display_sign(screen, room_count, high_score, font, sign_image, (5, WINDOW_HEIGHT - 145))
-        pygame.display.flip()
-        clock.tick(30)
-
+                pygame.transform.scale(world_surface, (WINDOW_WIDTH, WINDOW_HEIGHT), screen)
+        tracer.complete("draw world", draw_start, tier=quality["name"])
+        with tracer.span("draw hud"):
+            hud.draw(screen, health=state["player_health"], sign=(state["room_count"], high_score))
+        if frame_capture:
+            with tracer.span("capture"):
+                frame_capture.capture(screen)
+        with tracer.span("flip"):
+            pygame.display.flip()
+        input_layer.presented()
+        startup_trace.first_frame("main")
+        with tracer.span("wait"):
+            if scripted and speed <= 0:
+                clock.tick()  # Uncapped playback
+            elif scripted:
+                clock.tick(FPS * speed)
+            else:
+                clock.tick(FPS)
+        if governor.record_frame(clock.get_rawtime()):  # Work time only, not the clock's sleep
+            tracer.instant("quality change", tier=governor.tier["name"])
+        tracer.complete("frame", frame_start, tick=state["tick"])
+
+    if not running:
+        record_run("quit")
+    persistence.close()
+    if recorder:
+        recorder.close()
+    if frame_capture:
+        frame_capture.close()
+        print(frame_capture.report())
+    if not scripted:
+        print(input_layer.report())
+    print(state["enemy_pool"].report())
+    loaders.report("main")
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="HabitsEscape room game")
+    parser.add_argument("--record", metavar="PATH", help="record this run's seed and input to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a replay file instead of reading the keyboard")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay and bot speed multiplier, 0 for uncapped")
+    parser.add_argument("--seed", type=int, help="seed for room generation")
+    parser.add_argument("--bot", action="store_true", help="let the scripted bot play, seeded with the run's seed")
+    parser.add_argument("--world", default=f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}", metavar="WIDTHxHEIGHT",
+                        help="room size in pixels; larger than the window scrolls with the player")
+    parser.add_argument("--obstacle-density", type=float, default=1.0, help="obstacles per window-sized area, relative to normal")
+    parser.add_argument("--enemy-density", type=float, default=1.0, help="enemies per window-sized area, relative to normal")
+    parser.add_argument("--internal-resolution", default=os.environ.get(render_target.INTERNAL_RESOLUTION_ENV), metavar="WIDTHxHEIGHT",
+                        help=f"draw the world at this size (e.g. 600x400) and upscale it; "
+                             f"defaults to ${render_target.INTERNAL_RESOLUTION_ENV}")
+    parser.add_argument("--room-library", default=ROOM_LIBRARY_FILE, metavar="PATH",
+                        help="pre-generated room layouts to use if the file exists; an empty path generates every room")
+    parser.add_argument("--capture", default=os.environ.get(CAPTURE_ENV), metavar="PATH",
+                        help=f"record every frame to a directory of PNGs or a .rgb raw video file; defaults to ${CAPTURE_ENV}")
+    parser.add_argument("--capture-encoder", metavar="COMMAND",
+                        help="record every frame by piping raw RGB24 video to this command; "
+                             "{width}, {height} and {fps} are filled in")
+    args = parser.parse_args()
+    try:
+        world_size = simulation.parse_world_size(args.world, args.obstacle_density)
+        if args.seed is not None and not 0 <= args.seed <= replay.MAX_SEED:
+            raise ValueError(f"--seed must be between 0 and {replay.MAX_SEED}")
+        if args.record and max(world_size) > replay.MAX_WORLD_SIDE:
+            raise ValueError(f"--record supports worlds up to {replay.MAX_WORLD_SIDE} pixels per side")
+        render_target.internal_render_scale(args.internal_resolution, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    except ValueError as e:
+        parser.error(str(e))
+    main(args.record, args.replay, args.speed, args.seed,
+         world_size, args.obstacle_density, args.enemy_density, args.internal_resolution,
+         args.room_library, args.bot, args.capture, args.capture_encoder)
@@ -1,10 +1,12 @@
+import startup_trace  # First, so startup tracing sees every import
 import pygame
 import sys
+import loaders
+import tracer
 import os
 from datetime import datetime, timedelta
-
-# Initialize Pygame
-pygame.init()
+from transitions import fade_in, fade_out
+from ui import UI, Button, ImagePanel, InputBox, Label
 
 # Screen dimensions
 SCREEN_WIDTH = 800
@@ -16,35 +18,46 @@ BLACK = (0, 0, 0)
 GRAY = (100, 100, 100)
 DARK_GRAY = (40, 40, 40)
 
-# Fonts
-TITLE_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 40)
-QUESTION_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 25)
-BUTTON_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 20)
-
-# Screen setup
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("HabitsEscape")
-
 # Outside files
 DATA_FILE = "player_data.txt"
-fire_icon = pygame.image.load("assets/others/fire.png") # Fire image for streak
-fire_icon = pygame.transform.scale(fire_icon, (40, 40))  # Resize as needed
-BACKGROUND = pygame.image.load("assets/others/menu_background.png")
-BACKGROUND = pygame.transform.scale(BACKGROUND, (SCREEN_WIDTH, SCREEN_HEIGHT))  # Scale to screen size
-LOGO = pygame.image.load("assets/others/logo.png")
 
-# Set game icon
-pygame.display.set_icon(LOGO)
-
-def draw_text(text, font, color, x, y, centered=True):
-    """Helper function to render text on the screen."""
-    text_surface = font.render(text, True, color)
-    text_rect = text_surface.get_rect()
-    if centered:
-        text_rect.center = (x, y)
-    else:
-        text_rect.topleft = (x, y)
-    screen.blit(text_surface, text_rect)
+# Window, fonts and images, created by init() so importing this module has no side effects
+screen = None
+TITLE_FONT = None
+QUESTION_FONT = None
+BUTTON_FONT = None
+fire_icon = None
+BACKGROUND = None
+LOGO = None
+
+def init():
+    """Initialize pygame, open the menu window and load fonts and images. Safe to call repeatedly."""
+    global screen, TITLE_FONT, QUESTION_FONT, BUTTON_FONT, fire_icon, BACKGROUND, LOGO
+    if screen is not None:
+        return
+
+    pygame.init()
+    loaders.set_scene("menu")
+    tracer.set_scene("menu")
+
+    # Fonts
+    TITLE_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 40)
+    QUESTION_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 25)
+    BUTTON_FONT = pygame.font.Font("assets/others/8bit_font.ttf", 20)
+
+    # Screen setup
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("HabitsEscape")
+
+    fire_icon = loaders.load_image("assets/others/fire.png") # Fire image for streak
+    fire_icon = loaders.scale(fire_icon, (40, 40))  # Resize as needed
+    BACKGROUND = loaders.load_image("assets/others/menu_background.png")
+    BACKGROUND = loaders.scale(BACKGROUND, (SCREEN_WIDTH, SCREEN_HEIGHT))  # Scale to screen size
+    LOGO = loaders.load_image("assets/others/logo.png")
+
+    # Set game icon
+    pygame.display.set_icon(LOGO)
+    startup_trace.mark("menu assets loaded")
 
 def ensure_data_file_exists():
     """Ensure the player data file exists, and create it if missing."""
@@ -96,176 +109,138 @@ def check_and_update_streak():
 
 def choose_addiction():
     """Prompt the player to choose their addiction."""
-    addiction = None
-    running = True
-    while running:
+    init()
+    clock = pygame.time.Clock()
+    ui = UI(
+        Label("Choose your addiction:", QUESTION_FONT, BLACK, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)),
+        Button((SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, 300, 50), "Smoking", BUTTON_FONT, DARK_GRAY,
+               "Smoking", border_radius=20),
+        Button((SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 50, 300, 50), "Drinking", BUTTON_FONT, DARK_GRAY,
+               "Drinking", border_radius=20),
+    )
+    while True:
         screen.fill(WHITE)
-        draw_text("Choose your addiction:", QUESTION_FONT, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-
-        # Addiction options as buttons
-        smoking_button = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, 300, 50)
-        drinking_button = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 50, 300, 50)
-
-        pygame.draw.rect(screen, DARK_GRAY, smoking_button, border_radius=20)
-        pygame.draw.rect(screen, DARK_GRAY, drinking_button, border_radius=20)
-
-        draw_text("Smoking", BUTTON_FONT, WHITE, smoking_button.centerx, smoking_button.centery)
-        draw_text("Drinking", BUTTON_FONT, WHITE, drinking_button.centerx, drinking_button.centery)
+        ui.draw(screen)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-                if smoking_button.collidepoint(event.pos):
-                    addiction = "Smoking"
-                elif drinking_button.collidepoint(event.pos):
-                    addiction = "Drinking"
-                if addiction:
-                    write_player_data("Addiction", addiction)
-                    running = False
+            addiction = ui.handle(event)
+            if addiction:
+                write_player_data("Addiction", addiction)
+                return addiction
 
         pygame.display.flip()
-
-    return addiction
+        startup_trace.first_frame("menu")
+        clock.tick(30)
 
 def ask_question(addiction):
     """Ask a context-specific question based on the addiction."""
-    running = True
-    answered_yes = False
-    input_active = False
-    input_text = ""
-
-    while running:
+    init()
+    clock = pygame.time.Clock()
+    transition = fade_in((SCREEN_WIDTH, SCREEN_HEIGHT), DARK_GRAY).start()
+    question = f"Have you {'smoked' if addiction == 'Smoking' else 'had any drinks'} today?"
+    question_ui = UI(
+        Label(question, QUESTION_FONT, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)),
+        Button((SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2, 100, 50), "Yes", BUTTON_FONT, GRAY, "yes", border_radius=20),
+        Button((SCREEN_WIDTH // 2 + 50, SCREEN_HEIGHT // 2, 100, 50), "No", BUTTON_FONT, GRAY, "no", border_radius=20),
+    )
+    amount_ui = UI(
+        Label("How many?", QUESTION_FONT, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)),
+        InputBox((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50), BUTTON_FONT, GRAY),
+    )
+    ui = question_ui
+
+    while True:
         screen.fill(DARK_GRAY)
-
-        if not answered_yes:
-            question = f"Have you {'smoked' if addiction == 'Smoking' else 'had any drinks'} today?"
-            draw_text(question, QUESTION_FONT, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-            
-            yes_button = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2, 100, 50)
-            no_button = pygame.Rect(SCREEN_WIDTH // 2 + 50, SCREEN_HEIGHT // 2, 100, 50)
-            pygame.draw.rect(screen, GRAY, yes_button, border_radius=20)
-            pygame.draw.rect(screen, GRAY, no_button, border_radius=20)
-            draw_text("Yes", BUTTON_FONT, WHITE, yes_button.centerx, yes_button.centery)
-            draw_text("No", BUTTON_FONT, WHITE, no_button.centerx, no_button.centery)
-        else:
-            draw_text("How many?", QUESTION_FONT, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
-            input_box = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2, 200, 50)
-            pygame.draw.rect(screen, GRAY, input_box, border_radius=20)
-            draw_text(input_text, BUTTON_FONT, WHITE, input_box.centerx, input_box.centery)
+        ui.draw(screen)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if not answered_yes:
-                    if yes_button.collidepoint(event.pos):
-                        answered_yes = True
-                        input_active = True
-                        write_player_data("Streak", "0")
-                        write_player_data("LastAnswered", datetime.now().strftime("%Y-%m-%d"))
-                    elif no_button.collidepoint(event.pos):
-                        last_answered = read_player_data().get("LastAnswered", "None")
-                        today = datetime.now().date().strftime("%Y-%m-%d")
-                        if last_answered != today:
-                            streak = int(read_player_data().get("Streak", 0)) + 1
-                            write_player_data("Streak", str(streak))
-                        write_player_data("LastAnswered", today)
-                        write_player_data("Amount", "0")
-                        return
-                elif input_active and input_box.collidepoint(event.pos):
-                    input_active = True
-            elif event.type == pygame.KEYDOWN and input_active:
-                if event.key == pygame.K_RETURN:
-                    if input_text.isdigit():
-                        amount = int(input_text)
-                        write_player_data("Amount", str(amount))
-                        return
-                    else:
-                        input_text = ""
-                elif event.key == pygame.K_BACKSPACE:
-                    input_text = input_text[:-1]
-                elif event.unicode.isdigit():
-                    input_text += event.unicode
+            result = ui.handle(event)
+            if result == "yes":
+                write_player_data("Streak", "0")
+                write_player_data("LastAnswered", datetime.now().strftime("%Y-%m-%d"))
+                ui = amount_ui
+            elif result == "no":
+                last_answered = read_player_data().get("LastAnswered", "None")
+                today = datetime.now().date().strftime("%Y-%m-%d")
+                if last_answered != today:
+                    streak = int(read_player_data().get("Streak", 0)) + 1
+                    write_player_data("Streak", str(streak))
+                write_player_data("LastAnswered", today)
+                write_player_data("Amount", "0")
+                return
+            elif ui is amount_ui and result is not None:
+                write_player_data("Amount", str(result))
+                return
+
+        # Fade in over the question without blocking input
+        if not transition.done:
+            transition.update()
+            transition.draw(screen)
 
         pygame.display.flip()
-
-def fade_to_black(duration=1000):
-    """Fade to black effect."""
-    fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    fade_surface.fill(DARK_GRAY)
-    fade_surface.set_alpha(0)  # Start fully transparent
-    for alpha in range(0, 256, int(255 / (duration / 16))):  # Update alpha gradually
-        fade_surface.set_alpha(min(alpha, 255))  # Ensure alpha doesn't go over 255
-        screen.fill(WHITE)  # Fill screen with white (background color)
-        screen.blit(fade_surface, (0, 0))  # Apply the fade effect
-        pygame.display.update()  # Update the display
-        pygame.time.delay(16)  # Delay to create smooth transition
-
-def fade_from_black(duration=1000):
-    """Fade from black effect."""
-    fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    fade_surface.fill(DARK_GRAY)
-    fade_surface.set_alpha(255)  # Start fully opaque
-    for alpha in range(255, -1, -int(255 / (duration / 16))):  # Update alpha gradually
-        fade_surface.set_alpha(max(alpha, 0))  # Ensure alpha doesn't go below 0
-        screen.fill(WHITE)  # Fill screen with white (background color)
-        screen.blit(fade_surface, (0, 0))  # Apply the fade effect
-        pygame.display.update()  # Update the display
-        pygame.time.delay(16)  # Delay to create smooth transition
+        startup_trace.first_frame("menu")
+        clock.tick(30)
 
 def main_menu():
     """Main menu loop."""
+    init()
     data = read_player_data()
     streak = data.get("Streak", "0")
-    running = True
-    while running:
-        # screen.fill(DARK_GRAY)
-        screen.blit(BACKGROUND, (0, 0))
-
-        draw_text("HabitsEscape", TITLE_FONT, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
-        streak_y = SCREEN_HEIGHT // 4 + 80
-        draw_text(f"Streak: {streak}", QUESTION_FONT, WHITE, SCREEN_WIDTH // 2, streak_y)
-
-        # Draw the streak text first
-        streak_text = f"Streak: {streak}"
-        streak_text_surface = QUESTION_FONT.render(streak_text, True, WHITE)
-        streak_text_rect = streak_text_surface.get_rect(center=(SCREEN_WIDTH // 2, streak_y))
-        screen.blit(streak_text_surface, streak_text_rect)
-
-        # Now position the fire icon right next to the text
-        fire_icon_rect = fire_icon.get_rect()
-        fire_icon_rect.midleft = streak_text_rect.right, streak_y - 10  # Align fire icon to the right of the streak text
-
-        # Blit the fire icon to the screen
-        screen.blit(fire_icon, fire_icon_rect)
-
-        play_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 40, 200, 60)
-        quit_button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 40, 200, 60)
-
-        pygame.draw.rect(screen, GRAY, play_button_rect, border_radius=20)
-        pygame.draw.rect(screen, GRAY, quit_button_rect, border_radius=20)
-
-        draw_text("Play", BUTTON_FONT, WHITE, play_button_rect.centerx, play_button_rect.centery)
-        draw_text("Quit", BUTTON_FONT, WHITE, quit_button_rect.centerx, quit_button_rect.centery)
+    clock = pygame.time.Clock()
+    transition = fade_in((SCREEN_WIDTH, SCREEN_HEIGHT), DARK_GRAY).start()
+    leaving = False  # Set once Play is clicked and the fade out is running
+
+    streak_y = SCREEN_HEIGHT // 4 + 80
+    streak_label = Label(f"Streak: {streak}", QUESTION_FONT, WHITE, (SCREEN_WIDTH // 2, streak_y))
+    fire_icon_rect = fire_icon.get_rect()
+    fire_icon_rect.midleft = streak_label.rect.right, streak_y - 10  # Align fire icon to the right of the streak text
+    ui = UI(
+        ImagePanel(BACKGROUND, (0, 0)),
+        Label("HabitsEscape", TITLE_FONT, WHITE, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)),
+        streak_label,
+        ImagePanel(fire_icon, fire_icon_rect.topleft),
+        Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 40, 200, 60), "Play", BUTTON_FONT, GRAY, "play", border_radius=20),
+        Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 40, 200, 60), "Quit", BUTTON_FONT, GRAY, "quit", border_radius=20),
+    )
+
+    while True:
+        ui.draw(screen)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if play_button_rect.collidepoint(event.pos):
-                    fade_from_black()# Fade out before transitioning
-                    os.system("python home.py")
-                    pygame.quit()
-                    return
-                elif quit_button_rect.collidepoint(event.pos):
-                    pygame.quit()
-                    return
+            choice = ui.handle(event)
+            if leaving:
+                continue
+            if choice == "play":
+                # Fade out before transitioning; the loop keeps handling events meanwhile
+                transition = fade_out((SCREEN_WIDTH, SCREEN_HEIGHT), DARK_GRAY).start()
+                leaving = True
+            elif choice == "quit":
+                pygame.quit()
+                return
+
+        if not transition.done:
+            transition.update()
+        transition.draw(screen)
 
         pygame.display.flip()
+        startup_trace.first_frame("menu")
+        clock.tick(30)
+
+        if leaving and transition.done:
+            loaders.report()  # Before handing over to the next scene
+            pygame.quit()  # Close the menu window first; it would stop responding while home.py runs
+            with tracer.span("scene switch menu -> home", "scene"):
+                os.system("python home.py")
+            return
 
 if __name__ == "__main__":
     ensure_data_file_exists()
@@ -275,7 +250,5 @@ if __name__ == "__main__":
         addiction = choose_addiction()
     else:
         addiction = player_data["Addiction"]
-    fade_to_black() 
     ask_question(addiction)
-    fade_to_black()  
     main_menu()
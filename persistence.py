@@ -0,0 +1,103 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+FLUSH_INTERVAL = 2.0  # Seconds between flushes of pending writes
+RUN_HISTORY_FILE = "run_history.csv"
+RUN_HISTORY_FIELDS = ("finished", "seed", "rooms", "damage_taken", "duration_s", "outcome")
+
+
+def write_high_score(file_path, high_score):
+    """Write the high score file atomically: a crash leaves the old or the new file, never half of one."""
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(f"0 {high_score}")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, file_path)
+
+
+def append_runs(file_path, runs):
+    """Append run records as CSV rows in a single write, adding the header to a new file."""
+    lines = [",".join(str(run[field]) for field in RUN_HISTORY_FIELDS) + "\n" for run in runs]
+    if not os.path.exists(file_path):
+        lines.insert(0, ",".join(RUN_HISTORY_FIELDS) + "\n")
+    with open(file_path, "a") as file:
+        file.write("".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class PersistenceWorker:
+    """
+    Background writer for the high score and the run history.
+
+    The game thread only puts updates on a queue. The worker coalesces them
+    (only the latest high score is written, run records are batched) and
+    flushes every FLUSH_INTERVAL seconds and on close(), which also runs at
+    interpreter exit. Disk I/O errors are printed, never raised into the game.
+    """
+
+    def __init__(self, high_score_path, history_path=RUN_HISTORY_FILE, flush_interval=FLUSH_INTERVAL):
+        self.high_score_path = high_score_path
+        self.history_path = history_path
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.pending_high_score = None
+        self.pending_runs = []
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def save_high_score(self, high_score):
+        """Queue a new high score; returns immediately."""
+        self.queue.put(("high_score", high_score))
+
+    def record_run(self, seed, rooms, damage_taken, duration_s, outcome):
+        """Queue one finished run (a life ending in death, or quitting) for the run history."""
+        self.queue.put(("run", {
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": seed,
+            "rooms": rooms,
+            "damage_taken": round(damage_taken, 1),
+            "duration_s": round(duration_s, 1),
+            "outcome": outcome,
+        }))
+
+    def close(self):
+        """Flush everything still queued and stop the worker. Safe to call more than once."""
+        if self.thread.is_alive():
+            self.queue.put(("close", None))
+            self.thread.join()
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                kind, value = self.queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                kind, value = None, None
+
+            if kind == "high_score":
+                self.pending_high_score = value
+            elif kind == "run":
+                self.pending_runs.append(value)
+
+            if kind == "close" or time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+            if kind == "close":
+                return
+
+    def _flush(self):
+        try:
+            if self.pending_high_score is not None:
+                write_high_score(self.high_score_path, self.pending_high_score)
+                self.pending_high_score = None
+            if self.pending_runs:
+                append_runs(self.history_path, self.pending_runs)
+                self.pending_runs = []
+        except OSError as e:
+            print(f"Error saving game data: {e}")
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pygame
+
+import loaders
+
+# Cache of derived surfaces keyed by (operation, source surface, parameters)
+_cache = {}
+
+
+def cached(key, build):
+    """Return the cached result for key, building it on first use."""
+    result = _cache.get(key)
+    if result is None:
+        result = build()
+        _cache[key] = result
+        if loaders.ENABLED and isinstance(key[1], pygame.Surface):
+            loaders.track(result, f"{loaders.label_of(key[1])} {key[0]}", key[0], speculative=True)
+    return result
+
+
+def clear_cache():
+    """Drop every cached effect (e.g. when the source surfaces are reloaded)."""
+    _cache.clear()
+
+
+def _box_blur_axis(pixels, radius, axis):
+    """Box blur a float array along one axis using a running sum (cost independent of radius)."""
+    size = 2 * radius + 1
+    pad = [(0, 0)] * pixels.ndim
+    pad[axis] = (radius + 1, radius)
+    sums = np.cumsum(np.pad(pixels, pad, mode="edge"), axis=axis)
+    upper = np.take(sums, np.arange(size, sums.shape[axis]), axis=axis)
+    lower = np.take(sums, np.arange(0, sums.shape[axis] - size), axis=axis)
+    return (upper - lower) / size
+
+
+def _gaussian_kernel(sigma):
+    """Normalised 1D gaussian weights covering three standard deviations."""
+    radius = max(1, int(math.ceil(sigma * 3)))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+    weights = np.exp(-(offsets ** 2) / (2 * sigma * sigma))
+    return radius, weights / weights.sum()
+
+
+def _convolve_axis(pixels, weights, radius, axis):
+    """Convolve a float array with a 1D kernel along one axis."""
+    pad = [(0, 0)] * pixels.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(pixels, pad, mode="edge")
+    length = pixels.shape[axis]
+    result = np.zeros_like(pixels)
+    for i, weight in enumerate(weights):
+        result += weight * np.take(padded, np.arange(i, i + length), axis=axis)
+    return result
+
+
+def _with_rgb(surface, pixels):
+    """Copy surface and replace its colour channels, keeping any per-pixel alpha."""
+    result = surface.copy()
+    rgb = pygame.surfarray.pixels3d(result)
+    rgb[...] = np.clip(pixels, 0, 255).astype(np.uint8)
+    del rgb  # Release the surface lock
+    return result
+
+
+def box_blur(surface, radius, passes=1):
+    """Separable box blur; three passes approximate a gaussian."""
+    if radius <= 0:
+        return surface.copy()
+    pixels = pygame.surfarray.array3d(surface).astype(np.float32)
+    for _ in range(passes):
+        pixels = _box_blur_axis(pixels, radius, 0)
+        pixels = _box_blur_axis(pixels, radius, 1)
+    return _with_rgb(surface, pixels)
+
+
+def gaussian_blur(surface, sigma):
+    """Separable gaussian blur. Best for small sigmas; use box_blur with passes=3 for large ones."""
+    if sigma <= 0:
+        return surface.copy()
+    radius, weights = _gaussian_kernel(sigma)
+    pixels = pygame.surfarray.array3d(surface).astype(np.float32)
+    pixels = _convolve_axis(pixels, weights, radius, 0)
+    pixels = _convolve_axis(pixels, weights, radius, 1)
+    return _with_rgb(surface, pixels)
+
+
+def _vignette_mask(size, strength):
+    """Per-pixel brightness factors falling off towards the corners."""
+    width, height = size
+    xs = np.linspace(-1.0, 1.0, width, dtype=np.float32)[:, None]
+    ys = np.linspace(-1.0, 1.0, height, dtype=np.float32)[None, :]
+    distance = np.sqrt(xs * xs + ys * ys) / math.sqrt(2)
+    return (1.0 - strength * distance ** 2)[:, :, None]
+
+
+def darken(surface, amount=0.5, vignette=0.0):
+    """Scale brightness by (1 - amount), optionally with a vignette towards the edges."""
+    pixels = pygame.surfarray.array3d(surface).astype(np.float32) * (1.0 - amount)
+    if vignette > 0:
+        mask = cached(("vignette", surface.get_size(), vignette),
+                      lambda: _vignette_mask(surface.get_size(), vignette))
+        pixels *= mask
+    return _with_rgb(surface, pixels)
+
+
+def tint(surface, color, strength=0.6):
+    """Blend the surface's colours towards color, keeping its transparency."""
+    pixels = pygame.surfarray.array3d(surface).astype(np.float32)
+    pixels = pixels * (1.0 - strength) + np.array(color[:3], dtype=np.float32) * strength
+    return _with_rgb(surface, pixels)
+
+
+def hit_flash(surface, color=(255, 0, 0), strength=0.6):
+    """Cached tinted variant of a sprite, used while it is flashing from a hit."""
+    return cached(("hit_flash", surface, tuple(color), strength),
+                  lambda: tint(surface, color, strength))
+
+
+def backdrop(surface, blur_radius=10, dim=0.35, vignette=0.5):
+    """
+    Build a blurred, darkened copy of a frame for overlay screens (death, pause).
+
+    The blur runs at half resolution with three box passes and is scaled back up,
+    so the one-off cost stays small even for full-window captures.
+    """
+    width, height = surface.get_size()
+    small = pygame.transform.smoothscale(surface, (max(1, width // 2), max(1, height // 2)))
+    small = box_blur(small, max(1, blur_radius // 2), passes=3)
+    blurred = pygame.transform.smoothscale(small, (width, height))
+    return darken(blurred, dim, vignette)
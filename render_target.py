@@ -0,0 +1,25 @@
+import pygame
+
+INTERNAL_RESOLUTION_ENV = "HABITS_INTERNAL_RESOLUTION"  # e.g. "600x400"; scenes started later inherit it
+
+
+def internal_render_scale(resolution, window_size):
+    """
+    Scale of the internal render target for a "WIDTHxHEIGHT" resolution, or 1
+    when resolution is empty. The window must be a whole multiple of it, so
+    the upscale turns every internal pixel into an exact square of pixels.
+    """
+    if not resolution:
+        return 1
+    width, height = (int(value) for value in resolution.lower().split("x"))
+    window_width, window_height = window_size
+    factor = window_width // width
+    if factor < 1 or width * factor != window_width or height * factor != window_height:
+        raise ValueError(f"internal resolution {resolution} must divide the {window_width}x{window_height} "
+                         f"window by a whole number")
+    return 1 / factor
+
+
+def present(surface, screen):
+    """Upscale the internal render target onto the screen with nearest-neighbour scaling."""
+    pygame.transform.scale(surface, screen.get_size(), screen)
@@ -0,0 +1,177 @@
+import argparse
+import struct
+import time
+
+import simulation
+from room_library import ROOM_LIBRARY_FILE, open_library
+
+# File layout: header, then (run length varint, input mask byte) pairs until EOF
+REPLAY_MAGIC = b"HERP"
+REPLAY_VERSION = 6  # Bumped whenever the simulation's results change
+# magic, version, seed, amount, fps, world size, obstacle/enemy density, room library id (0 for none)
+HEADER = struct.Struct("<4sBQiBHHffI")
+MAX_SEED = 2 ** 64 - 1
+MAX_WORLD_SIDE = 0xFFFF
+
+
+def _write_varint(file, value):
+    """Write an unsigned LEB128 integer."""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            file.write(bytes((byte | 0x80,)))
+        else:
+            file.write(bytes((byte,)))
+            return
+
+
+def _read_varint(data, offset):
+    """Read an unsigned LEB128 integer, returning (value, next offset)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class Recorder:
+    """
+    Record the per-tick input bitmask of a run as run-length encoded bytes.
+
+    Held keys produce long runs of the same mask, so a minute of play is
+    usually a few hundred bytes.
+    """
+
+    def __init__(self, path, seed, amount, world_size=(simulation.WINDOW_WIDTH, simulation.WINDOW_HEIGHT),
+                 obstacle_density=1.0, enemy_density=1.0, fps=simulation.FPS, library_id=0):
+        # Packed before the file is opened, so a run that can't be recorded leaves no partial file behind
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"replays need a seed between 0 and {MAX_SEED}, not {seed}")
+        if max(world_size) > MAX_WORLD_SIDE:
+            raise ValueError(f"replays support worlds up to {MAX_WORLD_SIDE} pixels per side")
+        try:
+            header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, amount, fps,
+                                 world_size[0], world_size[1], obstacle_density, enemy_density, library_id)
+        except struct.error as e:
+            raise ValueError(f"this run can't be stored in a replay header: {e}") from None
+        self.file = open(path, "wb")
+        self.file.write(header)
+        self.mask = None
+        self.run = 0
+
+    def record(self, inputs):
+        """Append one tick of input."""
+        if inputs == self.mask:
+            self.run += 1
+            return
+        self._write_run()
+        self.mask = inputs
+        self.run = 1
+
+    def _write_run(self):
+        if self.run:
+            _write_varint(self.file, self.run)
+            self.file.write(bytes((self.mask,)))
+
+    def close(self):
+        """Write the pending run and close the file."""
+        if self.file.closed:
+            return
+        self._write_run()
+        self.run = 0
+        self.file.close()
+
+
+def load_replay(path):
+    """Read a replay file. Returns (header dict, list of (run length, mask))."""
+    with open(path, "rb") as file:
+        data = file.read()
+
+    (magic, version, seed, amount, fps, world_width, world_height, obstacle_density, enemy_density,
+     library_id) = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a replay file (or uses an unsupported version)")
+
+    runs = []
+    offset = HEADER.size
+    while offset < len(data):
+        length, offset = _read_varint(data, offset)
+        runs.append((length, data[offset]))
+        offset += 1
+    header = {
+        "seed": seed,
+        "amount": amount,
+        "fps": fps,
+        "world_size": (world_width, world_height),
+        "obstacle_density": obstacle_density,
+        "enemy_density": enemy_density,
+        "library_id": library_id,
+        "ticks": sum(length for length, _ in runs),
+    }
+    return header, runs
+
+
+def replay_library(header, path=ROOM_LIBRARY_FILE):
+    """The room library a replay was recorded with, or None if it used generated rooms."""
+    if not header["library_id"]:
+        return None
+    library = open_library(path)
+    if library is None or library.library_id != header["library_id"]:
+        raise ValueError(f"The replay was recorded with a different room library than {path}")
+    return library
+
+
+def iter_inputs(runs):
+    """Expand run-length encoded input back into one mask per tick."""
+    for length, mask in runs:
+        for _ in range(length):
+            yield mask
+
+
+def play_headless(path):
+    """
+    Replay a recording through simulation.step as fast as possible, without a window.
+
+    Returns the final state and the wall-clock cost of each tick in milliseconds.
+    """
+    header, runs = load_replay(path)
+    state = simulation.new_game(header["seed"], header["amount"], header["world_size"],
+                                header["obstacle_density"], header["enemy_density"],
+                                room_library=replay_library(header))
+    step_times = []
+    for inputs in iter_inputs(runs):
+        start = time.perf_counter()
+        simulation.step(state, inputs)
+        step_times.append((time.perf_counter() - start) * 1000)
+        if state["dead"]:
+            break
+    return state, step_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded run headlessly and report per-tick cost.")
+    parser.add_argument("path", help="Replay file written by main.py --record")
+    args = parser.parse_args()
+
+    header, _ = load_replay(args.path)
+    start = time.perf_counter()
+    state, step_times = play_headless(args.path)
+    elapsed = time.perf_counter() - start
+
+    ticks = len(step_times)
+    ordered = sorted(step_times)
+    print(f"Seed: {header['seed']}  Amount: {header['amount']}  Recorded ticks: {header['ticks']}")
+    print(f"Replayed {ticks} ticks in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"Rooms reached: {state['room_count']}  Died: {state['dead']}")
+    if ticks:
+        print(f"Tick cost ms: mean {sum(step_times) / ticks:.3f}  "
+              f"p95 {ordered[min(ticks - 1, int(ticks * 0.95))]:.3f}  max {ordered[-1]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
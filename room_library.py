@@ -0,0 +1,176 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+import zlib
+from multiprocessing import Pool
+
+from game_logic import (
+    generate_building_obstacles,
+    generate_door_position_on_edge,
+    get_valid_starting_position,
+    generate_enemy_positions,
+    ensure_path,
+    walk_path,
+)
+from geometry import Rect
+from simulation import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SIZE, ENEMY_SIZE, TILE_SIZE, DOOR_SIZE, SPACING, OBSTACLE_COUNT, EDGE_BUFFER,
+    BUILDING_IDS, scaled_count, parse_world_size,
+)
+
+ROOM_LIBRARY_FILE = "room_library.bin"
+LIBRARY_MAGIC = b"HERL"
+LIBRARY_VERSION = 1
+# magic, version, build seed, world size, obstacles per layout, enemy spawns per layout, layout count
+HEADER = struct.Struct("<4sBQHHBBI")
+MAX_WORLD_SIDE = 0xFFFF  # World size and positions are stored as unsigned 16-bit values
+MAX_OBSTACLES = 0xFF  # Obstacles per layout are counted in one byte
+MAX_LAYOUTS = 0xFFFFFFFF
+MAX_ENEMY_SPAWNS = 24  # Spawn points stored per layout; rooms needing more enemies are generated at runtime
+REACHABILITY_STEP = PLAYER_SIZE // 2  # Grid spacing of the reachability search, in pixels
+
+
+def record_struct(obstacle_count, enemy_spawns):
+    """Layout record: obstacles (x, y, width, height, sprite id), player start, door, enemy spawns (x, y, speed factor)."""
+    return struct.Struct("<" + "HHffB" * obstacle_count + "HH" + "HH" + "HHf" * enemy_spawns)
+
+
+def is_reachable(start, door_pos, obstacles, world_width, world_height):
+    """True if the player can walk from start to the door, moving REACHABILITY_STEP at a time."""
+    door_rect = Rect(door_pos[0], door_pos[1], DOOR_SIZE, DOOR_SIZE)
+    return walk_path(start, door_rect, obstacles, PLAYER_SIZE, world_width, world_height, REACHABILITY_STEP) is not None
+
+
+def generate_layout(seed, world_size, obstacle_count, enemy_spawns=MAX_ENEMY_SPAWNS):
+    """Generate one validated layout with the runtime generators. Returns (obstacles, player_pos, door_pos, spawns)."""
+    rng = random.Random(seed)
+    world_width, world_height = world_size
+    while True:
+        obstacles = generate_building_obstacles(
+            obstacle_count, TILE_SIZE, SPACING, world_width, world_height, EDGE_BUFFER, BUILDING_IDS, rng
+        )
+        player_pos = get_valid_starting_position(obstacles, PLAYER_SIZE, world_width, world_height, EDGE_BUFFER, TILE_SIZE, rng)
+        door_pos = generate_door_position_on_edge(obstacles, world_width, world_height, DOOR_SIZE, EDGE_BUFFER, TILE_SIZE, rng)
+        obstacles = ensure_path(player_pos, door_pos, obstacles, TILE_SIZE, world_width, world_height, PLAYER_SIZE, BUILDING_IDS, rng)
+        if is_reachable(player_pos, door_pos, obstacles, world_width, world_height):
+            break
+    # Spawns are placed against the final obstacles; speed factors are scaled by the room's enemy level
+    enemies = generate_enemy_positions(obstacles, enemy_spawns, ENEMY_SIZE, world_width, world_height, EDGE_BUFFER,
+                                       TILE_SIZE, 0, 1, rng)
+    spawns = [(enemy["pos"][0], enemy["pos"][1], enemy["speed"]) for enemy in enemies]
+    return obstacles, player_pos, door_pos, spawns
+
+
+def _build_chunk(job):
+    """Worker: generate and pack a range of layouts."""
+    seed, start, count, world_size, obstacle_count = job
+    record = record_struct(obstacle_count, MAX_ENEMY_SPAWNS)
+    packed = bytearray()
+    for index in range(start, start + count):
+        obstacles, player_pos, door_pos, spawns = generate_layout(seed * 1000003 + index, world_size, obstacle_count)
+        values = [value for obstacle in obstacles for value in obstacle]
+        values += list(player_pos) + list(door_pos)
+        values += [value for spawn in spawns for value in spawn]
+        packed += record.pack(*values)
+    return start, bytes(packed)
+
+
+def build_library(path, count, seed=0, world_size=(WINDOW_WIDTH, WINDOW_HEIGHT), obstacle_density=1.0,
+                  workers=None, chunk=256):
+    """
+    Generate count layouts across worker processes and write them as
+    fixed-size records. Raises ValueError if the options don't fit the format.
+    """
+    obstacle_count = scaled_count(OBSTACLE_COUNT, obstacle_density, *world_size)
+    if not (0 < min(world_size) and max(world_size) <= MAX_WORLD_SIDE):
+        raise ValueError(f"world size must be between 1 and {MAX_WORLD_SIDE} pixels per side")
+    if obstacle_count > MAX_OBSTACLES:
+        raise ValueError(f"{obstacle_count} obstacles per layout is more than the library format's {MAX_OBSTACLES}; "
+                         f"lower the world size or the obstacle density")
+    if not 1 <= count <= MAX_LAYOUTS:
+        raise ValueError(f"layout count must be between 1 and {MAX_LAYOUTS}")
+    if not 0 <= seed < 2 ** 64:
+        raise ValueError("seed must be a non-negative 64-bit integer")
+    jobs = [(seed, start, min(chunk, count - start), world_size, obstacle_count) for start in range(0, count, chunk)]
+    with open(path, "wb") as file, Pool(workers) as pool:
+        file.write(HEADER.pack(LIBRARY_MAGIC, LIBRARY_VERSION, seed, world_size[0], world_size[1],
+                               obstacle_count, MAX_ENEMY_SPAWNS, count))
+        for _, packed in pool.imap(_build_chunk, jobs):  # In order, so records land at their index
+            file.write(packed)
+
+
+class RoomLibrary:
+    """
+    Read-only view of a layout library file through mmap.
+
+    Layouts are fixed-size records, so picking one is an offset computation
+    and a struct unpack; only the pages of layouts actually used are read,
+    whatever the size of the file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.seed, width, height, self.obstacle_count, self.enemy_spawns, self.count = \
+            HEADER.unpack_from(self.data)
+        if magic != LIBRARY_MAGIC or version != LIBRARY_VERSION:
+            raise ValueError(f"{path} is not a room library (or uses an unsupported version)")
+        self.world_size = (width, height)
+        self.record = record_struct(self.obstacle_count, self.enemy_spawns)
+        if len(self.data) < HEADER.size + self.count * self.record.size:
+            raise ValueError(f"{path} is truncated")
+        self.library_id = zlib.crc32(self.data[:HEADER.size])  # Replays store this to find the same library
+
+    def matches(self, world_size, obstacle_count):
+        """True if the library has layouts and they fit a run with this world size and obstacle count."""
+        return self.count > 0 and tuple(world_size) == self.world_size and obstacle_count == self.obstacle_count
+
+    def layout(self, index):
+        """Layout index as (obstacles, player_pos, door_pos, spawns)."""
+        values = self.record.unpack_from(self.data, HEADER.size + index * self.record.size)
+        end = self.obstacle_count * 5
+        obstacles = [tuple(values[offset:offset + 5]) for offset in range(0, end, 5)]
+        player_pos = [values[end], values[end + 1]]
+        door_pos = [values[end + 2], values[end + 3]]
+        spawns = [values[offset:offset + 3] for offset in range(end + 4, len(values), 3)]
+        return obstacles, player_pos, door_pos, spawns
+
+    def pick(self, rng):
+        """A layout chosen by the run's random generator."""
+        return self.layout(rng.randrange(self.count))
+
+
+def open_library(path=ROOM_LIBRARY_FILE):
+    """The RoomLibrary at path, or None if there is no library file or it holds no layouts."""
+    if not path or not os.path.exists(path):
+        return None
+    library = RoomLibrary(path)
+    return library if library.count else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate validated room layouts into a memory-mappable library.")
+    parser.add_argument("--count", type=int, default=20000, help="number of layouts")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first layout; layouts use derived seeds")
+    parser.add_argument("--world", default=f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}", metavar="WIDTHxHEIGHT", help="room size in pixels")
+    parser.add_argument("--obstacle-density", type=float, default=1.0, help="obstacles per window-sized area, relative to normal")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--out", default=ROOM_LIBRARY_FILE, help="library file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        world_size = parse_world_size(args.world, args.obstacle_density)
+        build_library(args.out, args.count, args.seed, world_size, args.obstacle_density, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    library = RoomLibrary(args.out)
+    print(f"{library.count} layouts ({library.record.size} bytes each, {os.path.getsize(args.out) / 2 ** 20:.1f}MB) "
+          f"written to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import random
+from geometry import Rect, sweep_move
+from game_logic import (
+    generate_building_obstacles,
+    generate_door_position_on_edge,
+    get_valid_starting_position,
+    generate_enemy_positions,
+    ensure_path,
+    separate_enemies,
+)
+import ai_scheduler
+import broadphase
+import tracer
+from checkpoint import RoomCheckpoint
+from enemy_pool import EnemyPool
+
+# Constants
+WINDOW_WIDTH = 1200
+WINDOW_HEIGHT = 800
+PLAYER_SIZE = 50
+ENEMY_SIZE = 50
+TILE_SIZE = 115
+DOOR_SIZE = 100
+SPACING = 250
+OBSTACLE_COUNT = 8
+EDGE_BUFFER = 150
+ENEMY_COUNT = 5
+PLAYER_HEALTH = 100
+DAMAGE_COOLDOWN = 1000  # Milliseconds
+ATTACK_REACH = 30  # Pixels the attack reaches past each side of the player
+HIT_ANIMATION_DURATION = 200  # Duration for player hit animation in milliseconds
+IDLE_THRESHOLD = 5000  # Milliseconds without movement before the idle skin shows
+FPS = 30
+FRAME_MS = 1000 / FPS  # Simulated time per tick
+ENEMY_LEVEL_STEP = 0.2  # Enemy level multiplier gained per room
+ENEMY_COUNT_STEP = 3  # One extra enemy every this many rooms
+
+# Building sprite ids stored in obstacles; the renderer maps them to images
+BUILDING_IDS = [0, 1, 2]
+
+# Input bitmask, one bit per key the game reads
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_ATTACK = 16
+INPUT_MOVE = INPUT_LEFT | INPUT_RIGHT | INPUT_UP | INPUT_DOWN
+
+
+def get_player_level_multiplier(amount):
+    """Player stat multiplier from the daily Amount answer: fewer means stronger."""
+    if amount == 0:
+        return 2
+    return 1 / amount + 1
+
+
+def scaled_count(base_count, density, world_width, world_height):
+    """Scale a per-window count by density and by how many windows fit in the world."""
+    area_ratio = (world_width * world_height) / (WINDOW_WIDTH * WINDOW_HEIGHT)
+    return max(1, round(base_count * density * area_ratio))
+
+
+def parse_world_size(text, obstacle_density=1.0):
+    """
+    Parse a "WIDTHxHEIGHT" world size, raising ValueError if it is malformed or
+    if the room's obstacles can't be placed in it. Buildings go at random
+    spots inside EDGE_BUFFER, and placement retries until each one fits, so
+    the area must hold at least that many of the tallest building side by side.
+    """
+    try:
+        world_width, world_height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"world size must look like WIDTHxHEIGHT, not {text!r}") from None
+    columns = (world_width - 2 * EDGE_BUFFER) // TILE_SIZE
+    rows = int((world_height - 2 * EDGE_BUFFER) // (TILE_SIZE * 1.5))
+    obstacle_count = scaled_count(OBSTACLE_COUNT, obstacle_density, world_width, world_height)
+    if columns < 1 or rows < 1 or columns * rows < obstacle_count:
+        raise ValueError(f"a {world_width}x{world_height} world can't fit its {obstacle_count} buildings; "
+                         f"make it larger or lower the obstacle density")
+    return world_width, world_height
+
+
+def attack_range(player_pos):
+    """The rect an attack from player_pos hits."""
+    return Rect(
+        player_pos[0] - ATTACK_REACH,  # Expand left
+        player_pos[1] - ATTACK_REACH,  # Expand upward
+        PLAYER_SIZE + 2 * ATTACK_REACH,  # Expand width
+        PLAYER_SIZE + 2 * ATTACK_REACH  # Expand height
+    )
+
+
+def generate_room(state, enemy_count, enemy_health):
+    """
+    Generate obstacles, player start, door and enemies for a new room into state.
+
+    With a room library in state, the layout is picked from it (one rng draw)
+    instead of being generated; rooms with more enemies than the library has
+    spawn points are still generated.
+    """
+    rng = state["rng"]
+    pool = state["enemy_pool"]
+    pool.release_all(state.get("enemies", []))  # Previous room's records are reused
+    library = state["room_library"]
+    if library is not None and enemy_count <= library.enemy_spawns:
+        with tracer.span("room library", "generation", count=enemy_count):
+            obstacles, player_pos, door_pos, spawns = library.pick(rng)
+            level_multiplier = state["enemy_level_multiplier"]
+            enemies = [pool.acquire(x, y, enemy_health, speed * level_multiplier) for x, y, speed in spawns[:enemy_count]]
+        state["obstacles"] = obstacles
+    else:
+        world_width = state["world_width"]
+        world_height = state["world_height"]
+        with tracer.span("generate_building_obstacles", "generation"):
+            obstacles = generate_building_obstacles(
+                state["obstacle_count"], TILE_SIZE, SPACING, world_width, world_height, EDGE_BUFFER, BUILDING_IDS, rng
+            )
+        with tracer.span("get_valid_starting_position", "generation"):
+            player_pos = get_valid_starting_position(obstacles, PLAYER_SIZE, world_width, world_height, EDGE_BUFFER, TILE_SIZE, rng)
+        with tracer.span("generate_door_position_on_edge", "generation"):
+            door_pos = generate_door_position_on_edge(obstacles, world_width, world_height, DOOR_SIZE, EDGE_BUFFER, TILE_SIZE, rng)
+        with tracer.span("generate_enemy_positions", "generation", count=enemy_count):
+            enemies = generate_enemy_positions(
+                obstacles, enemy_count, ENEMY_SIZE, world_width, world_height, EDGE_BUFFER, TILE_SIZE, enemy_health,
+                state["enemy_level_multiplier"], rng, pool
+            )
+        with tracer.span("ensure_path", "generation"):
+            state["obstacles"] = ensure_path(player_pos, door_pos, obstacles, TILE_SIZE, world_width, world_height, PLAYER_SIZE, BUILDING_IDS, rng)
+    state["player_pos"] = player_pos
+    state["door_pos"] = door_pos
+    state["enemies"] = enemies
+    state["room_checkpoint"] = RoomCheckpoint(state)  # What "retry this room" goes back to
+
+
+def new_game(seed=None, amount=0, world_size=(WINDOW_WIDTH, WINDOW_HEIGHT), obstacle_density=1.0, enemy_density=1.0,
+             enemy_level_step=ENEMY_LEVEL_STEP, enemy_count_step=ENEMY_COUNT_STEP, room_library=None):
+    """
+    Create the state for a new run.
+
+    All randomness comes from a Random seeded with seed, so the same seed and the
+    same per-tick inputs always reproduce the same run. world_size may be larger
+    than the window (the renderer scrolls); the densities scale the default
+    obstacle and enemy counts per window-sized area. enemy_level_step and
+    enemy_count_step are the difficulty curve tuned by balance_sweep.py.
+    room_library is an optional RoomLibrary of pre-generated layouts; it is
+    used only if its layouts match the world size and obstacle count.
+    """
+    world_width, world_height = world_size
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    player_level_multiplier = get_player_level_multiplier(amount)
+    obstacle_count = scaled_count(OBSTACLE_COUNT, obstacle_density, world_width, world_height)
+    if room_library is not None and not room_library.matches(world_size, obstacle_count):
+        room_library = None
+    state = {
+        "seed": seed,
+        "rng": random.Random(seed),
+        "tick": 0,
+        "time": 0,
+        "room_count": 0,
+        "player_level_multiplier": player_level_multiplier,
+        "move_speed": 7 * player_level_multiplier,
+        "player_health": 100 * player_level_multiplier,
+        "player_damage": 50 * player_level_multiplier,
+        "enemy_level_multiplier": 1,
+        "last_damage_time": 0,
+        "damage_taken": 0,  # Total over the run, for the run history
+        "player_last_hit_time": 0,
+        "last_input_time": 0,
+        "player_facing": "right",
+        "dead": False,
+        "world_width": world_width,
+        "world_height": world_height,
+        "obstacle_count": obstacle_count,
+        "enemy_count": scaled_count(ENEMY_COUNT, enemy_density, world_width, world_height),
+        "enemy_level_step": enemy_level_step,
+        "enemy_count_step": enemy_count_step,
+        "enemy_pool": EnemyPool(),
+        "enemy_index": None,  # Last tick's SweepIndex over the enemies, None once it no longer matches them
+        "room_library": room_library,
+    }
+    generate_room(state, state["enemy_count"], 100)
+    state["start_checkpoint"] = state["room_checkpoint"]  # What "restart" goes back to
+    return state
+
+
+def enter_next_room(state):
+    """Advance to the next room, scaling enemy stats."""
+    state["room_count"] += 1
+    state["enemy_level_multiplier"] += state["enemy_level_step"]
+
+    # Scale enemy stats
+    scaled_enemy_count = state["enemy_count"] + (state["room_count"] // state["enemy_count_step"])  # More enemies every few rooms
+    scaled_enemy_health = 100 * state["enemy_level_multiplier"]  # Increase health by 10 per room
+    generate_room(state, scaled_enemy_count, scaled_enemy_health)
+
+
+def retry_room(state):
+    """Restore the current room as it was when the player entered it."""
+    state["room_checkpoint"].restore(state)
+
+
+def restart(state):
+    """Restore the first room of the run with the player's starting stats."""
+    state["start_checkpoint"].restore(state)
+    state["room_checkpoint"] = state["start_checkpoint"]
+
+
+def step(state, inputs):
+    """Advance the simulation by one tick using an input bitmask (INPUT_* bits)."""
+    state["tick"] += 1
+    state["time"] += FRAME_MS
+    current_time = state["time"]
+    enemies = state["enemies"]
+    obstacles = state["obstacles"]
+    player_pos = state["player_pos"]
+
+    if inputs & INPUT_MOVE:
+        state["last_input_time"] = current_time
+
+    # Player movement logic
+    with tracer.span("player movement", "sim"):
+        move_speed = state["move_speed"]
+        dx = dy = 0
+        if inputs & INPUT_LEFT:
+            dx -= move_speed
+            state["player_facing"] = "left"
+        if inputs & INPUT_RIGHT:
+            dx += move_speed
+            state["player_facing"] = "right"
+        if inputs & INPUT_UP:
+            dy -= move_speed
+        if inputs & INPUT_DOWN:
+            dy += move_speed
+
+        # Swept against the buildings, sliding along them, so no move is too long to be blocked
+        if dx or dy:
+            player_pos = state["player_pos"] = list(
+                sweep_move(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE, dx, dy, obstacles)
+            )
+        player_rect = Rect(player_pos[0], player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
+
+    # Enemy movement logic; distant enemies update less often under a per-tick budget
+    with tracer.span("move enemies", "sim", enemies=len(enemies)):
+        ai_scheduler.update_enemies(enemies, player_pos, obstacles, state["tick"], ENEMY_SIZE)
+
+    # Sort enemies along x once per tick; attack, separation, damage and the renderer's culling all query this index
+    enemy_index = state["enemy_index"] = broadphase.SweepIndex(enemies, ENEMY_SIZE)
+
+    # Player attack logic
+    if inputs & INPUT_ATTACK and current_time - state["player_last_hit_time"] > HIT_ANIMATION_DURATION:
+        with tracer.span("attack", "sim"):
+            state["player_last_hit_time"] = current_time  # Record the time of the attack
+            for index in enemy_index.query(attack_range(player_pos)):
+                enemies[index]["health"] -= state["player_damage"]
+
+    # Keep enemies from stacking into a single pile
+    with tracer.span("separate enemies", "sim"):
+        pairs = enemy_index.overlapping_pairs()
+        if pairs:
+            separate_enemies(enemies, pairs, ENEMY_SIZE, obstacles)
+            # Pushed enemies may have crossed the player's edge; contacts and culling need their new positions
+            enemy_index = state["enemy_index"] = broadphase.SweepIndex(enemies, ENEMY_SIZE)
+
+    # Check for enemy collisions and apply damage
+    with tracer.span("damage", "sim"):
+        for index in enemy_index.query(player_rect):
+            enemy = enemies[index]
+            if enemy["health"] > 0 and current_time - state["last_damage_time"] > DAMAGE_COOLDOWN:
+                scaled_enemy_damage = 10 * state["enemy_level_multiplier"]  # Increase damage by 2 per room
+                state["player_health"] -= scaled_enemy_damage
+                state["damage_taken"] += scaled_enemy_damage
+                state["last_damage_time"] = current_time
+                enemy["last_hit_time"] = current_time  # Update last hit time
+
+        # Remove every enemy killed this tick in one batch
+        if broadphase.remove_dead(enemies, state["enemy_pool"]):
+            state["enemy_index"] = None  # Indices shifted; the renderer builds a fresh one
+
+    # Check for game over
+    if state["player_health"] <= 0:
+        state["dead"] = True
+        return
+
+    # Door collision and room transition
+    door_pos = state["door_pos"]
+    door_rect = Rect(door_pos[0], door_pos[1], DOOR_SIZE, DOOR_SIZE)
+    if player_rect.colliderect(door_rect) and not enemies:
+        with tracer.span("door transition", "generation", room=state["room_count"] + 1):
+            enter_next_room(state)
@@ -0,0 +1,66 @@
+# Opt-in cold start tracing.
+#
+# Set HABITS_STARTUP_TRACE=1 (child scenes started with os.system inherit it) and
+# each scene reports how long its imports took and how long it took to present
+# its first frame. Import this module before anything else so the import hook
+# sees every module.
+import builtins
+import os
+import sys
+import time
+
+ENABLED = os.environ.get("HABITS_STARTUP_TRACE", "") not in ("", "0")
+TRACE_LOG_FILE = "startup_trace.log"
+REPORTED_IMPORTS = 12  # Slowest imports listed in the report
+
+_start = time.perf_counter()
+_import_times = {}
+_marks = []
+_reported = False
+_original_import = builtins.__import__
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """builtins.__import__ wrapper recording the inclusive time of each first import."""
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_times.setdefault(name, (time.perf_counter() - start) * 1000)
+
+
+if ENABLED:
+    builtins.__import__ = _timed_import
+
+
+def mark(label):
+    """Record a named startup milestone (e.g. "assets loaded")."""
+    if ENABLED:
+        _marks.append((label, (time.perf_counter() - _start) * 1000))
+
+
+def first_frame(scene):
+    """Call right after a scene's first display flip; prints and logs the report once."""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    builtins.__import__ = _original_import
+
+    total = (time.perf_counter() - _start) * 1000
+    lines = [f"[startup] {scene}: first frame after {total:.1f}ms"]
+    for label, elapsed in _marks:
+        lines.append(f"[startup] {scene}:   {label} at {elapsed:.1f}ms")
+    slowest = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)[:REPORTED_IMPORTS]
+    for name, elapsed in slowest:
+        lines.append(f"[startup] {scene}:   import {name} {elapsed:.1f}ms")
+
+    report = "\n".join(lines)
+    print(report)
+    try:
+        with open(TRACE_LOG_FILE, "a") as file:
+            file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{report}\n")
+    except OSError as e:
+        print(f"Error writing startup trace: {e}")
@@ -0,0 +1,26 @@
+import simulation
+from simulation import DAMAGE_COOLDOWN, ENEMY_SIZE
+
+
+def contact_state(enemy_positions):
+    """A state with no buildings, the player at (500, 500) and motionless enemies at enemy_positions."""
+    state = simulation.new_game(1)
+    state["obstacles"] = []
+    state["player_pos"] = [500, 500]
+    state["door_pos"] = [0, 0]
+    state["time"] = DAMAGE_COOLDOWN * 10  # Damage is off cooldown
+    pool = state["enemy_pool"]
+    pool.release_all(state["enemies"])
+    state["enemies"] = [pool.acquire(x, y, 100, 0) for x, y in enemy_positions]
+    return state
+
+
+def test_enemy_pushed_onto_player_deals_damage():
+    # Two overlapping enemies just left of the player; separation pushes the right one 15px across its edge
+    state = contact_state([(500 - ENEMY_SIZE - 5, 500), (500 - ENEMY_SIZE - 25, 500)])
+    health = state["player_health"]
+    simulation.step(state, 0)
+    pushed = state["enemies"][0]["pos"]
+    assert pushed[0] + ENEMY_SIZE > 500  # Now overlapping the player
+    assert state["player_health"] < health
+
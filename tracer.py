@@ -0,0 +1,120 @@
+# Opt-in timeline tracing in the Chrome trace-event format.
+#
+# Set HABITS_TRACE=1 (child scenes started with os.system inherit it) and each
+# scene buffers spans for its frame phases, room generation, asset loads and
+# scene switches in memory, then writes trace_<scene>.json when the process
+# exits. Open the files in chrome://tracing or https://ui.perfetto.dev; all
+# scenes share one clock, so their files can be loaded side by side.
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENABLED = os.environ.get("HABITS_TRACE", "") not in ("", "0")
+MAX_EVENTS = 500000  # Oldest events are dropped past this, so long sessions keep the recent past
+
+# Microseconds on a wall-clock base, so traces from different scene processes line up
+_clock_offset = time.time_ns() - time.perf_counter_ns()
+_events = deque(maxlen=MAX_EVENTS)
+_pid = os.getpid()
+_scene = None
+
+
+def now():
+    """Current trace timestamp in microseconds."""
+    return (time.perf_counter_ns() + _clock_offset) / 1000
+
+
+def _emit(event):
+    event["pid"] = _pid
+    event["tid"] = threading.get_ident()
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = now()
+        return self
+
+    def __exit__(self, *exc_info):
+        complete(self.name, self.start, self.category, **self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, category="frame", **args):
+    """Context manager recording a span around its block (a shared no-op when tracing is off)."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def complete(name, start, category="frame", **args):
+    """Record a span that started at start (from now()) and ends now."""
+    if ENABLED:
+        end = now()
+        _emit({"name": name, "cat": category, "ph": "X", "ts": start, "dur": end - start, "args": args})
+
+
+def begin(name, category="frame"):
+    """Open a span closed by end(name); for phases that don't fit a with block."""
+    if ENABLED:
+        _emit({"name": name, "cat": category, "ph": "B", "ts": now()})
+
+
+def end(name, category="frame"):
+    """Close the span opened by begin(name)."""
+    if ENABLED:
+        _emit({"name": name, "cat": category, "ph": "E", "ts": now()})
+
+
+def instant(name, category="frame", **args):
+    """Record a point in time, e.g. a tier change or a death."""
+    if ENABLED:
+        _emit({"name": name, "cat": category, "ph": "i", "s": "p", "ts": now(), "args": args})
+
+
+def set_scene(scene):
+    """Name this process in the trace and write the trace to trace_<scene>.json on exit."""
+    global _scene
+    if not ENABLED:
+        return
+    if _scene is None:
+        atexit.register(write)
+    _scene = scene
+    _emit({"name": "process_name", "ph": "M", "ts": 0, "args": {"name": scene}})
+    instant(f"scene {scene}", "scene")
+
+
+def write(path=None):
+    """Write the buffered events as a trace-event JSON file."""
+    if not ENABLED or not _events:
+        return
+    path = path or f"trace_{_scene or 'game'}.json"
+    try:
+        with open(path, "w") as file:
+            json.dump({"traceEvents": list(_events), "displayTimeUnit": "ms"}, file)
+        print(f"Trace with {len(_events)} events written to {path}")
+    except OSError as e:
+        print(f"Error writing trace: {e}")
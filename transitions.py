@@ -0,0 +1,68 @@
+import pygame
+
+FADE_STEPS = 64  # Number of precomputed alpha levels per transition
+
+
+class Transition:
+    """
+    A timed full-screen colour overlay that a scene draws on top of its own frame.
+
+    The owning scene keeps running its normal loop (events, drawing, clock.tick)
+    and calls update() and draw() once per frame; the alpha is looked up from a
+    precomputed table using the elapsed time, so frame rate never changes the
+    length of the fade.
+    """
+
+    def __init__(self, size, color, duration=1000, fade_out=True, steps=FADE_STEPS):
+        self.overlay = pygame.Surface(size)
+        self.overlay.fill(color)
+        self.duration = max(1, duration)
+
+        # Alpha table from transparent to opaque (fade out) or the reverse (fade in)
+        self.alphas = [round(255 * i / (steps - 1)) for i in range(steps)]
+        if not fade_out:
+            self.alphas.reverse()
+
+        self.start_time = None
+        self.alpha = self.alphas[0]
+        self.done = False
+
+    def start(self, now=None):
+        """Start (or restart) the transition at the given time in milliseconds."""
+        self.start_time = pygame.time.get_ticks() if now is None else now
+        self.alpha = self.alphas[0]
+        self.done = False
+        return self
+
+    def update(self, now=None):
+        """Advance the transition to the given time. Returns True once it has finished."""
+        if self.start_time is None:
+            self.start(now)
+        if now is None:
+            now = pygame.time.get_ticks()
+
+        elapsed = now - self.start_time
+        if elapsed >= self.duration:
+            self.alpha = self.alphas[-1]
+            self.done = True
+        else:
+            index = max(0, elapsed) * (len(self.alphas) - 1) // self.duration
+            self.alpha = self.alphas[int(index)]
+        return self.done
+
+    def draw(self, screen):
+        """Blit the overlay at its current alpha; fully transparent frames cost nothing."""
+        if self.alpha <= 0:
+            return
+        self.overlay.set_alpha(self.alpha)
+        screen.blit(self.overlay, (0, 0))
+
+
+def fade_out(size, color, duration=1000):
+    """Create a transition that fades the scene out into the given colour."""
+    return Transition(size, color, duration, fade_out=True)
+
+
+def fade_in(size, color, duration=1000):
+    """Create a transition that fades the scene in from the given colour."""
+    return Transition(size, color, duration, fade_out=False)
@@ -0,0 +1,208 @@
+import pygame
+
+WHITE = (255, 255, 255)
+HOVER_LIGHTEN = 30  # Added to each channel of a hovered button's color
+PRESS_DARKEN = 30  # Taken from each channel of a pressed button's color
+
+
+def _shade(color, amount):
+    return tuple(max(0, min(255, channel + amount)) for channel in color[:3])
+
+
+class Widget:
+    """
+    Base of the retained-mode widgets: a rect and a cached surface.
+
+    Subclasses return their visual state from state() and draw it in
+    render(); the surface is rendered again only when that state changes
+    (hover, press, a text edit), so drawing an unchanged widget is one blit.
+    """
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.hovered = False
+        self.pressed = False  # Mouse button went down on it and hasn't been released
+        self._surface = None
+        self._state = None
+
+    def state(self):
+        """Everything render() depends on."""
+        return None
+
+    def render(self):
+        """Draw the widget onto a new surface the size of its rect; a plain Widget is transparent."""
+        return pygame.Surface(self.rect.size, pygame.SRCALPHA)
+
+    def surface(self):
+        """The cached surface, rendered again if the state changed."""
+        state = self.state()
+        if self._surface is None or state != self._state:
+            self._surface = self.render()
+            self._state = state
+        return self._surface
+
+    def handle(self, event):
+        """Handle a mouse event inside the widget or a key event; returns a result for the caller or None."""
+        return None
+
+
+class Label(Widget):
+    """Single line of text centered on center; change .text to update it."""
+
+    def __init__(self, text, font, color, center):
+        self.font = font
+        self.color = color
+        self.center = center
+        self.text = text
+        super().__init__(self._place(font.size(text)))
+
+    def _place(self, size):
+        rect = pygame.Rect((0, 0), size)
+        rect.center = self.center
+        return rect
+
+    def state(self):
+        return self.text
+
+    def render(self):
+        surface = self.font.render(self.text, True, self.color)
+        self.rect = self._place(surface.get_size())
+        return surface
+
+
+class ImagePanel(Widget):
+    """A static image, e.g. a sign or an icon."""
+
+    def __init__(self, image, topleft):
+        self.image = image
+        super().__init__(image.get_rect(topleft=topleft))
+
+    def render(self):
+        return self.image
+
+
+class Button(Widget):
+    """
+    Filled, optionally rounded button with a centered label.
+
+    It lightens while hovered and darkens while pressed, and returns its value
+    from handle() when clicked (on press, as the game's buttons always have).
+    """
+
+    def __init__(self, rect, text, font, color, value, text_color=WHITE, border_radius=0):
+        super().__init__(rect)
+        self.text = text
+        self.font = font
+        self.color = color
+        self.value = value
+        self.text_color = text_color
+        self.border_radius = border_radius
+
+    def state(self):
+        return self.text, self.hovered, self.pressed
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        color = self.color
+        if self.pressed:
+            color = _shade(color, -PRESS_DARKEN)
+        elif self.hovered:
+            color = _shade(color, HOVER_LIGHTEN)
+        pygame.draw.rect(surface, color, surface.get_rect(), border_radius=self.border_radius)
+        text = self.font.render(self.text, True, self.text_color)
+        surface.blit(text, text.get_rect(center=surface.get_rect().center))
+        return surface
+
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.pressed = True
+            return self.value
+        return None
+
+
+class InputBox(Widget):
+    """
+    Rounded box for typing a whole number.
+
+    Digits and backspace edit the text while the box is active; Enter returns
+    the number from handle() if there is one, and clears the box otherwise.
+    """
+
+    def __init__(self, rect, font, color, text_color=WHITE, border_radius=20, max_length=6, active=True):
+        super().__init__(rect)
+        self.font = font
+        self.color = color
+        self.text_color = text_color
+        self.border_radius = border_radius
+        self.max_length = max_length
+        self.active = active
+        self.text = ""
+
+    def state(self):
+        return self.text
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, self.color, surface.get_rect(), border_radius=self.border_radius)
+        text = self.font.render(self.text, True, self.text_color)
+        surface.blit(text, text.get_rect(center=surface.get_rect().center))
+        return surface
+
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.active = True
+        elif event.type == pygame.KEYDOWN and self.active:
+            if event.key == pygame.K_RETURN:
+                if self.text.isdigit():
+                    return int(self.text)
+                self.text = ""
+            elif event.key == pygame.K_BACKSPACE:
+                self.text = self.text[:-1]
+            elif event.unicode.isdigit() and len(self.text) < self.max_length:
+                self.text += event.unicode
+        return None
+
+
+class UI:
+    """
+    A set of widgets drawn in order, with shared event dispatch.
+
+    Mouse events go to the topmost widget under the pointer, which also gets
+    the hover state; key events go to every widget. handle() returns the first
+    result a widget gives back (a clicked button's value, a submitted number).
+    """
+
+    def __init__(self, *widgets):
+        self.widgets = list(widgets)
+
+    def add(self, widget):
+        """Add a widget on top of the others; returns it."""
+        self.widgets.append(widget)
+        return widget
+
+    def widget_at(self, pos):
+        """Topmost widget whose rect contains pos, or None."""
+        for widget in reversed(self.widgets):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def draw(self, screen):
+        """Blit every widget's cached surface, re-rendering only those whose state changed."""
+        screen.blits([(widget.surface(), widget.rect) for widget in self.widgets], False)
+
+    def handle(self, event):
+        """Dispatch one pygame event; returns a widget's result or None."""
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            target = self.widget_at(event.pos)
+            for widget in self.widgets:
+                widget.hovered = widget is target
+                if event.type == pygame.MOUSEBUTTONUP:
+                    widget.pressed = False
+            return target.handle(event) if target else None
+        if event.type == pygame.KEYDOWN:
+            for widget in self.widgets:
+                result = widget.handle(event)
+                if result is not None:
+                    return result
+        return None